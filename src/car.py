@@ -1,8 +1,18 @@
 '''
 This module defines a Car class that represents a car with various attributes and methods to add details and display them.
 '''
+import csv
+import sys
+
+# Rows per transaction when bulk-loading from CSV (memory vs. commit cost)
+CSV_CHUNK_SIZE = 1000
+NO_SALESPERSON = "No Salesperson assigned for this car"
 
 class Car:
+    # Fixed attribute set: no per-instance __dict__ when many cars are loaded
+    __slots__ = ("make", "model", "color", "year", "price", "type", "condition",
+                 "drive_trains", "engine_power", "liter_capacity", "salesperson_car")
+
     def __init__(self):
         # Basic car attributes
         self.make = ""
@@ -17,7 +27,33 @@ class Car:
         self.liter_capacity = 0  # Engine capacity in liters
 
         # Assigned salesperson (default if not assigned)
-        self.salesperson_car = "No Salesperson assigned for this car"
+        self.salesperson_car = NO_SALESPERSON
+
+    @classmethod
+    def from_row(cls, row):
+        # Build a Car from a dict (e.g. a CSV row) without prompting for input.
+        # Numeric fields are coerced here, so bad text raises ValueError instead of being stored as TEXT.
+        car = cls()
+        car.make = (row.get("make") or "").strip()
+        car.model = (row.get("model") or "").strip()
+        car.color = (row.get("color") or "").strip()
+        car.year = int(row.get("year") or 0)
+        car.price = float(row.get("price") or 0)
+        car.type = (row.get("type") or "").strip()
+        car.condition = (row.get("condition") or "").strip()
+        car.drive_trains = (row.get("drive_trains") or "").strip()
+        car.engine_power = int(row.get("engine_power") or 0)
+        car.liter_capacity = int(row.get("liter_capacity") or 0)
+        car.salesperson_car = (row.get("salesperson") or "").strip() or car.salesperson_car
+        return car
+
+    def to_record(self):
+        # Column dict for Database.add_car / add_cars_bulk (the placeholder salesperson is stored as empty)
+        sales = "" if self.salesperson_car == NO_SALESPERSON else self.salesperson_car
+        return {"make": self.make, "model": self.model, "year": self.year, "price": self.price,
+                "color": self.color, "type": self.type, "condition": self.condition,
+                "drive_trains": self.drive_trains, "engine_power": self.engine_power,
+                "liter_capacity": self.liter_capacity, "salesperson": sales}
 
     def add_car_details(self):
         # Collecting car details from user input
@@ -32,13 +68,46 @@ class Car:
         self.engine_power = int(input("Engine power (CC): "))
         self.liter_capacity = int(input("Liter Capacity (L): "))
 
+    def format(self):
+        # The car's details as one block of text (callers can join many cars into a single write)
+        border = "/// " + "=" * 100 + " ///"
+        return "\n".join((
+            "",
+            border,
+            f"Make: {self.make} \tModel: {self.model} \tColor: {self.color} \tYear: {self.year} \tPrice: {self.price} EGP \tSalesperson: {self.salesperson_car}",
+            f"Type: {self.type} \tCondition: {self.condition} \tDrive Trains: {self.drive_trains} \tEngine Power: {self.engine_power} CC \tLiter Capacity: {self.liter_capacity} L",
+            border,
+            "",
+        ))
+
     def display_car(self):
-        # Printing the car's details in a formatted way
-        print("\n/// ==================================================================================================== ///")
-        print(f"Make: {self.make} \tModel: {self.model} \tColor: {self.color} \tYear: {self.year} \tPrice: {self.price} EGP \tSalesperson: {self.salesperson_car}")
-        print(f"Type: {self.type} \tCondition: {self.condition} \tDrive Trains: {self.drive_trains} \tEngine Power: {self.engine_power} CC \tLiter Capacity: {self.liter_capacity} L")
-        print("/// ==================================================================================================== ///\n")
+        # Printing the car's details in a formatted way (single write)
+        sys.stdout.write(self.format() + "\n")
 
     def return_make(self):
         # Return the make of the car (useful for searching or filtering)
         return self.make
+
+
+def bulk_insert_cars_from_csv(db, path, chunk_size=CSV_CHUNK_SIZE):
+    # Stream CSV rows into db.add_cars_bulk, one transaction per chunk.
+    # Each row goes through Car.from_row so numbers are real ints/floats; rows with
+    # extra cells or non-numeric numbers are skipped. Short rows get "" for the missing cells.
+    # Returns (rows inserted, CSV line numbers of the skipped rows).
+    total, skipped, records = 0, [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f, restval="")
+        for row in reader:
+            try:
+                if row.get(None):  # more cells than headers
+                    raise ValueError("extra cells")
+                records.append(Car.from_row(row).to_record())
+            except ValueError:
+                skipped.append(reader.line_num)
+                continue
+            if len(records) >= chunk_size:
+                total += db.add_cars_bulk(records)
+                records = []
+    if records:
+        total += db.add_cars_bulk(records)
+    return total, skipped
@@ -1,37 +1,123 @@
 import sqlite3
 from sqlite3 import Error
 import os
+import logging
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+__all__ = ["Database"]
+
+log = logging.getLogger("carmgmt.db")
+
+# (اسم العمود، str لو نصي بيتعمله strip) — بنفس ترتيب INSERT
+_CAR_FIELDS = (
+    ("make", str), ("model", str), ("year", None), ("price", None), ("color", str),
+    ("type", str), ("condition", str), ("drive_trains", str),
+    ("engine_power", None), ("liter_capacity", None), ("salesperson", str), ("image_path", str)
+)
+CAR_FIELDS = tuple(f for f, _ in _CAR_FIELDS)
+# نصوص SQL ثابتة: نفس النص في كل نداء = hit في statement cache بتاع sqlite3
+_SQL_INSERT_CAR = f"INSERT INTO cars ({', '.join(CAR_FIELDS)}) VALUES ({', '.join(['?'] * len(CAR_FIELDS))})"
+# أعمدة القوائم بدون image_path (يُجلب لوحده عند الحاجة)
+_CAR_COLUMNS = "id, make, model, year, price, color, type, condition, drive_trains, engine_power, liter_capacity, salesperson"
+_SQL_SELECT_ALL = f"SELECT {_CAR_COLUMNS} FROM cars"
+_SQL_SELECT_BY_MAKE = f"SELECT {_CAR_COLUMNS} FROM cars WHERE make=?"
+_SQL_SELECT_BY_ID = f"SELECT {_CAR_COLUMNS} FROM cars WHERE id=?"
+# أنواع الأعمدة الرقمية في تمثيل الأعمدة (SoA)؛ الباقي object
+_SOA_DTYPES = {"id": "int64", "year": "int64", "price": "float64",
+               "engine_power": "int64", "liter_capacity": "int64"}
+_SQL_SELECT_SUMMARIES = "SELECT make, model, year, price FROM cars"
+_SQL_SELECT_IMAGE_PATH = "SELECT image_path FROM cars WHERE id=?"
+_SQL_SELECT_GALLERY = "SELECT path FROM car_images WHERE car_id=?"
+_SQL_DELETE = "DELETE FROM cars WHERE id=?"
+
+
+@lru_cache(maxsize=64)
+def _build_update_sql(fields: tuple):
+    return f"UPDATE cars SET {', '.join(f'{k}=?' for k in fields)} WHERE id=?"
+
 
 class Database:
+    # سقف الـ memory-mapped I/O (SQLite بيعمل map للموجود فعلاً بس)
+    DEFAULT_MMAP = 256 << 20
+    # بالـ KiB (القيمة السالبة = KiB مش عدد صفحات) — 64 MiB
+    DEFAULT_CACHE_KIB = 64 << 10
+    PAGE_SIZE = 4096
+    # زوّده مع أي تغيير في الجداول/الفهارس عشان الترقية تشتغل تاني
+    SCHEMA_VERSION = 2
+
     def __init__(self, db_file="car_sales.db"):
         self.db_file = db_file
-        self.conn = self.create_connection(db_file)
-        self._apply_pragmas()
-        self.create_tables()     # إنشاء إن لم يوجد
-        self._migrate_schema()   # ترقية الأعمدة الناقصة (image_path)
-        self._create_indexes()   # فهارس مفيدة
-        self._debug_schema()     # Debug: اطبع الأعمدة عشان تتأكد
+        # اتصال لكل thread: القرّاء في WAL ميستنوش بعض، والكتابة عليها قفل واحد
+        self._db_file = os.path.abspath(db_file)
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._connections = []
+        if self._schema_version() != self.SCHEMA_VERSION:
+            self.create_tables()     # إنشاء إن لم يوجد
+            if self._migrate_schema():   # ترقية الأعمدة الناقصة (image_path)
+                self._create_indexes()   # فهارس مفيدة
+                self._analyze()          # إحصائيات المخطِّط مرة مع كل ترقية للمخطط
+                self._set_schema_version()
+        if os.environ.get("DB_DEBUG"):
+            self._debug_schema()     # Debug: اطبع الأعمدة عشان تتأكد
+
+    def _schema_version(self):
+        try:
+            return self.conn.execute("PRAGMA user_version").fetchone()[0]
+        except Error:
+            return 0
+
+    def _set_schema_version(self):
+        try:
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            self.conn.commit()
+        except Error as e:
+            log.error("user_version error: %s", e)
+
+    @property
+    def conn(self):
+        """اتصال الـ thread الحالي (بيتفتح أول مرة بس)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.create_connection(self._db_file)
+            self._apply_pragmas(conn)
+            self._local.conn = conn
+            with self._write_lock:
+                self._connections.append(conn)
+        return conn
 
     def create_connection(self, db_file):
         try:
             # استخدم مسار مطلق لتفادي اللبس
             abs_path = os.path.abspath(db_file)
-            print(f"[DB] Connecting to: {abs_path}")
-            conn = sqlite3.connect(abs_path)
+            # isolation_level=None: المعاملات يدوية (BEGIN IMMEDIATE) بدل BEGIN الضمني
+            conn = sqlite3.connect(abs_path, check_same_thread=False,
+                                   isolation_level=None, cached_statements=256)
+            # row["year"] بدل row[3] — نفس تكلفة tuple (مكتوب بـ C)
+            conn.row_factory = sqlite3.Row
+            # page_size لازم يتحدد قبل أول كتابة (وقبل WAL) على قاعدة جديدة
+            if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+                conn.execute(f"PRAGMA page_size = {self.PAGE_SIZE};")
             return conn
         except Error as e:
-            print(f"[DB] Connection error: {e}")
+            log.error("Connection error: %s", e)
             return None
 
-    def _apply_pragmas(self):
-        if not self.conn:
+    def _apply_pragmas(self, conn):
+        if not conn:
             return
         try:
-            self.conn.execute("PRAGMA foreign_keys = ON;")
-            self.conn.execute("PRAGMA journal_mode = WAL;")
-            self.conn.execute("PRAGMA synchronous = NORMAL;")
+            conn.execute("PRAGMA foreign_keys = ON;")
+            conn.execute("PRAGMA journal_mode = WAL;")
+            conn.execute("PRAGMA synchronous = NORMAL;")
+            conn.execute(f"PRAGMA cache_size = -{self.DEFAULT_CACHE_KIB};")
+            conn.execute(f"PRAGMA mmap_size = {self.DEFAULT_MMAP};")
+            conn.execute("PRAGMA temp_store = MEMORY;")
         except Error as e:
-            print(f"[DB] PRAGMA error: {e}")
+            log.error("PRAGMA error: %s", e)
 
     def create_tables(self):
         create_cars_table = """
@@ -51,7 +137,7 @@ class Database:
             image_path TEXT
         );
         """
-        self.execute_query(create_cars_table)
+        self._exec_write(create_cars_table)
 
         create_imgs = """
         CREATE TABLE IF NOT EXISTS car_images (
@@ -60,7 +146,7 @@ class Database:
             path TEXT
         );
         """
-        self.execute_query(create_imgs)
+        self._exec_write(create_imgs)
 
     def _migrate_schema(self):
         """أضف أي أعمدة ناقصة (خصوصًا image_path)"""
@@ -84,43 +170,104 @@ class Database:
             for name, sql_type in required.items():
                 if name not in existing:
                     self.conn.execute(f"ALTER TABLE cars ADD COLUMN {name} {sql_type}")
-                    print(f"[DB] MIGRATION: Added column {name} {sql_type}")
+                    log.info("MIGRATION: Added column %s %s", name, sql_type)
             self.conn.commit()
+            return True
         except Error as e:
-            print(f"[DB] Migration error: {e}")
+            log.error("Migration error: %s", e)
+            return False
 
     def _create_indexes(self):
         try:
-            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cars_make ON cars(make);")
+            # idx_cars_make مش بيتعمل هنا (make أول عمود في الفهارس المركبة)، لكن مش بنمسحه:
+            # واجهة gui.py بتنشئه على نفس الملف، والمسح هنا كان بيخلّي كل واجهة تعيد بناءه
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cars_year ON cars(year);")
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cars_price ON cars(price);")
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cars_condition ON cars(condition);")
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cars_drive ON cars(drive_trains);")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cars_summary ON cars(make, model, year, price);")
+            # فلاتر "ماركة + مدى سنة/سعر" (make+year مغطى بـ idx_cars_filter_cov)
+            self.conn.execute("DROP INDEX IF EXISTS idx_cars_make_year;")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cars_make_price ON cars(make, price);")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cars_filter_cov ON cars(make, year, price, condition);")
+            self.conn.commit()
+        except Error as e:
+            log.error("Index error: %s", e)
+
+    def _analyze(self):
+        """ANALYZE بعد بناء الفهارس (بيتنادى من ترقية user_version بس)"""
+        try:
+            self.conn.execute("DROP TABLE IF EXISTS _analyze_done;")   # علامة قديمة مبقتش لازمة
+            self.conn.execute("ANALYZE;")
             self.conn.commit()
         except Error as e:
-            print(f"[DB] Index error: {e}")
+            log.error("Analyze error: %s", e)
 
     def _debug_schema(self):
         try:
             cur = self.conn.execute("PRAGMA table_info(cars)")
             cols = [row[1] for row in cur.fetchall()]
-            print(f"[DB] cars columns: {cols}")
+            log.debug("cars columns: %s", cols)
         except Exception as e:
-            print(f"[DB] Debug schema error: {e}")
+            log.debug("Debug schema error: %s", e)
 
-    def execute_query(self, query, params=None):
+    def _exec_write(self, query, params=None):
+        try:
+            with self._write_lock:
+                cursor = self.conn.cursor()
+                if params is not None:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                self.conn.commit()
+            return cursor
+        except Error:
+            log.exception("Query failed: %s (params=%r)", query, params)
+            return None
+
+    def _exec_read(self, query, params=None):
+        """SELECT بدون commit (القراءة مش محتاجة sync للـ journal)"""
         try:
             cursor = self.conn.cursor()
             if params is not None:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            self.conn.commit()
             return cursor
-        except Error as e:
-            print(f"[DB] Query error: {e}\nSQL: {query}\nParams: {params}")
+        except Error:
+            log.exception("Query failed: %s (params=%r)", query, params)
             return None
 
+    # متوافقة مع الكود القديم (ManagingSystem) — مسار كتابة
+    def execute_query(self, query, params=None):
+        return self._exec_write(query, params)
+
+    def _execute_in_transaction(self, query, params, many=False):
+        """نفّذ INSERT/executemany داخل معاملة واحدة (BEGIN IMMEDIATE ... COMMIT)"""
+        cursor = self.conn.cursor()
+        with self._write_lock:
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                if many:
+                    cursor.executemany(query, params)
+                else:
+                    cursor.execute(query, params)
+                self.conn.commit()
+                return cursor
+            except Error:
+                self.conn.rollback()
+                log.exception("Transaction failed: %s", query)
+                return None
+            except BaseException:
+                # أي استثناء تاني (مثلاً generator بيرمي في النص) لازم يقفل المعاملة برضه
+                self.conn.rollback()
+                raise
+
+    @staticmethod
+    def _car_values(car_data: dict):
+        return tuple((car_data.get(f) or "").strip() if t is str else car_data.get(f)
+                     for f, t in _CAR_FIELDS)
+
     # ——— إدراج ———
     def add_car(self, car_data: dict):
         """
@@ -128,27 +275,7 @@ class Database:
         make, model, year, price, color, type, condition, drive_trains,
         engine_power, liter_capacity, salesperson, image_path (اختياري)
         """
-        fields = [
-            "make", "model", "year", "price", "color",
-            "type", "condition", "drive_trains",
-            "engine_power", "liter_capacity", "salesperson", "image_path"
-        ]
-        values = [
-            car_data.get("make", "").strip(),
-            car_data.get("model", "").strip(),
-            car_data.get("year", None),
-            car_data.get("price", None),
-            car_data.get("color", "").strip(),
-            car_data.get("type", "").strip(),
-            car_data.get("condition", "").strip(),
-            car_data.get("drive_trains", "").strip(),
-            car_data.get("engine_power", None),
-            car_data.get("liter_capacity", None),
-            car_data.get("salesperson", "").strip(),
-            car_data.get("image_path", "")
-        ]
-        q = f"INSERT INTO cars ({', '.join(fields)}) VALUES ({', '.join(['?']*len(fields))})"
-        cur = self.execute_query(q, values)
+        cur = self._execute_in_transaction(_SQL_INSERT_CAR, self._car_values(car_data))
         return cur.lastrowid if cur else None
 
     # متوافقة مع كود PySide6 اللي بيستخدم tuple بالترتيب الكامل
@@ -157,42 +284,118 @@ class Database:
         car_tuple: (make, model, year, price, color, type, condition, drive_trains,
                     engine_power, liter_capacity, salesperson, image_path)
         """
-        q = """
-        INSERT INTO cars
-        (make, model, year, price, color, type, condition, drive_trains, engine_power, liter_capacity, salesperson, image_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        cur = self.execute_query(q, car_tuple)
+        cur = self._execute_in_transaction(_SQL_INSERT_CAR, car_tuple)
         return cur.lastrowid if cur else None
 
+    def add_cars_bulk(self, cars):
+        """
+        إدراج مجموعة سيارات (dict أو tuple) في معاملة واحدة عبر executemany
+        بدل commit لكل صف. ترجع عدد الصفوف المُدرجة.
+        """
+        rows = (self._car_values(c) if isinstance(c, dict) else tuple(c) for c in cars)
+        cur = self._execute_in_transaction(_SQL_INSERT_CAR, rows, many=True)
+        return cur.rowcount if cur else 0
+
+    # نفس اسم/توقيع Database في gui.py عشان الاتنين يتبادلوا في مسارات الاستيراد
+    def insert_cars_bulk(self, rows):
+        """
+        rows: tuples بنفس ترتيب insert_car — معاملة واحدة (commit/fsync واحد)
+        مهما كان عدد الصفوف. ترجع عدد الصفوف المُدرجة.
+        """
+        cur = self._execute_in_transaction(_SQL_INSERT_CAR, rows, many=True)
+        return cur.rowcount if cur else 0
+
     # ——— قراءة ———
-    def fetch_all_cars(self):
-        cur = self.execute_query("SELECT * FROM cars")
+    def fetch_all_cars(self, columns=_CAR_COLUMNS):
+        q = _SQL_SELECT_ALL if columns == _CAR_COLUMNS else f"SELECT {columns} FROM cars"
+        cur = self._exec_read(q)
         return cur.fetchall() if cur else []
 
-    def fetch_cars_by_make(self, make):
-        cur = self.execute_query("SELECT * FROM cars WHERE make=?", (make,))
+    def fetch_cars_by_make(self, make, columns=_CAR_COLUMNS):
+        q = _SQL_SELECT_BY_MAKE if columns == _CAR_COLUMNS else f"SELECT {columns} FROM cars WHERE make=?"
+        cur = self._exec_read(q, (make,))
         return cur.fetchall() if cur else []
 
-    def fetch_car_by_id(self, car_id):
-        cur = self.execute_query("SELECT * FROM cars WHERE id=?", (car_id,))
+    def fetch_car_by_id(self, car_id, columns=_CAR_COLUMNS):
+        q = _SQL_SELECT_BY_ID if columns == _CAR_COLUMNS else f"SELECT {columns} FROM cars WHERE id=?"
+        cur = self._exec_read(q, (car_id,))
         return cur.fetchone() if cur else None
 
+    def fetch_all_cars_soa(self):
+        """
+        كل السيارات كأعمدة {اسم_العمود: array} بدل list of tuples —
+        مناسب للتحليلات (متوسطات/فلترة) على الأعمدة مباشرة.
+        """
+        names = [c.strip() for c in _CAR_COLUMNS.split(",")]
+        cur = self._exec_read(_SQL_SELECT_ALL)
+        rows = cur.fetchall() if cur else []
+        cols = list(zip(*rows)) if rows else [()] * len(names)
+        return {n: self._column_array(c, _SOA_DTYPES.get(n)) for n, c in zip(names, cols)}
+
+    @staticmethod
+    def _column_array(values, dtype):
+        # NULL في عمود رقمي → float64 بـ NaN، ونص غير رقمي → object
+        for dt in (dtype, "float64") if dtype else ():
+            try:
+                return np.array(values, dtype=dt)
+            except (TypeError, ValueError):
+                continue
+        return np.array(values, dtype=object)
+
+    def fetch_car_summaries(self):
+        """(make, model, year, price) بس — بيتغطّى بالكامل من idx_cars_summary"""
+        cur = self._exec_read(_SQL_SELECT_SUMMARIES)
+        return cur.fetchall() if cur else []
+
+    def fetch_car_images(self, car_id):
+        """مسار الصورة الرئيسية (لو موجودة) ثم صور المعرض"""
+        paths = []
+        cur = self._exec_read(_SQL_SELECT_IMAGE_PATH, (car_id,))
+        row = cur.fetchone() if cur else None
+        if row and row[0]:
+            paths.append(row[0])
+        cur = self._exec_read(_SQL_SELECT_GALLERY, (car_id,))
+        if cur:
+            paths.extend(r[0] for r in cur.fetchall())
+        return paths
+
     # ——— تحديث ———
     def update_car(self, car_id, updates: dict):
         if not updates:
             return None
-        set_clause = ", ".join([f"{k}=?" for k in updates.keys()])
         params = list(updates.values()) + [car_id]
-        q = f"UPDATE cars SET {set_clause} WHERE id=?"
-        return self.execute_query(q, params)
+        return self._exec_write(_build_update_sql(tuple(updates)), params)
 
     # ——— حذف ———
     def delete_car(self, car_id):
-        return self.execute_query("DELETE FROM cars WHERE id=?", (car_id,))
+        return self._exec_write(_SQL_DELETE, (car_id,))
 
-    def close(self):
+    # ——— صيانة ———
+    def vacuum_to_4k(self):
+        """
+        لقاعدة قديمة بـ page_size مختلف: VACUUM بيعيد البناء بالحجم الجديد.
+        WAL مبيسمحش بتغيير page_size، فبنرجع لـ DELETE مؤقتًا.
+        """
         try:
-            self.conn.close()
-        except Exception:
-            pass
\ No newline at end of file
+            current = self.conn.execute("PRAGMA page_size").fetchone()[0]
+            if current == self.PAGE_SIZE:
+                return False
+            self.conn.execute("PRAGMA journal_mode = DELETE;")
+            self.conn.execute(f"PRAGMA page_size = {self.PAGE_SIZE};")
+            self.conn.execute("VACUUM;")
+            self.conn.execute("PRAGMA journal_mode = WAL;")
+            log.info("VACUUM: page_size %s -> %s", current, self.PAGE_SIZE)
+            return True
+        except Error as e:
+            log.error("Vacuum error: %s", e)
+            return False
+
+    def close(self):
+        with self._write_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
\ No newline at end of file
@@ -1,35 +1,38 @@
 # -*- coding: utf-8 -*-
 import os
 import sys
+import csv
+import time
 import json
 import sqlite3
-import base64
+import shutil
+import tempfile
 import zipfile
-from collections import Counter
-import pandas as pd
+import importlib
+from itertools import chain, islice
+from contextlib import contextmanager
+from functools import lru_cache
+import numpy as np
 
 from PySide6.QtCore import (
     Qt, QAbstractTableModel, QModelIndex, QSize,
-    QSortFilterProxyModel, QSettings, QTimer, QPoint,
-    QByteArray, QBuffer, QIODevice
+    QSortFilterProxyModel, QSettings, QTimer, QPoint, QUrl,
+    QByteArray, QBuffer, QIODevice, Signal, QObject, QRunnable, QThreadPool, QSignalBlocker
 )
 from PySide6.QtGui import (
     QPixmap, QPalette, QColor, QKeySequence, QShortcut, QPainter, QFont,
-    QAction, QIcon, QCursor, QTextDocument
+    QAction, QIcon, QCursor, QTextDocument, QImageReader, QPixmapCache
 )
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QFrame, QPushButton,
     QLabel, QFileDialog, QMessageBox, QTableView, QSplitter, QGroupBox, QFormLayout,
     QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox, QDialog, QDialogButtonBox,
     QStackedWidget, QMenu, QStyle, QListWidget, QListWidgetItem, QToolButton, QStatusBar,
-    QHeaderView, QGraphicsDropShadowEffect, QAbstractItemView, QGridLayout, QCheckBox
+    QHeaderView, QGraphicsDropShadowEffect, QAbstractItemView, QGridLayout, QCheckBox, QProgressDialog
 )
 from PySide6.QtPrintSupport import QPrinter
 
-# Matplotlib
-import matplotlib
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
+# pandas / matplotlib / openpyxl / xlsxwriter / requests are imported where first used, keeping them off startup
 
 # Optional deps
 try:
@@ -37,18 +40,17 @@ try:
 except Exception:
     babel_format_currency = None
 
-try:
-    import requests
-except Exception:
-    requests = None
-
-from uuid import uuid4
+from urllib.parse import urlparse
 
 
 # --------- Constants ---------
 ENUM_TYPES = ["Sedan", "SUV", "Hatchback", "Convertible", "Coupe", "Truck", "Van"]
 ENUM_CONDITIONS = ["New", "Used", "Certified"]
 ENUM_DRIVES = ["FWD", "RWD", "AWD", "4WD"]
+# membership checks (combo boxes keep the ordered lists above)
+ENUM_TYPES_SET = frozenset(ENUM_TYPES)
+ENUM_CONDITIONS_SET = frozenset(ENUM_CONDITIONS)
+ENUM_DRIVES_SET = frozenset(ENUM_DRIVES)
 
 DISPLAY_COLS = list(range(12))
 HEADER_KEYS = [
@@ -71,9 +73,153 @@ FIELD_MAP = {
 NUMERIC_COLS = {0, 3, 4, 9, 10}
 INT_FIELDS = {"year", "engine_power", "liter_capacity"}
 FLOAT_FIELDS = {"price"}
+TEXT_REQUIRED = frozenset({"make", "model", "color", "salesperson"})
+TEXT_COLS = {1, 2, 5, 6, 7, 8, 11}
+COL_ALIGN = [Qt.AlignVCenter | (Qt.AlignLeft if c in TEXT_COLS else Qt.AlignRight) for c in range(len(DISPLAY_COLS))]
+# NumPy dtype per cars column (id .. image_path) for the table model's column store
+COL_DTYPES = [np.int64, object, object, np.int64, np.float64, object, object, object, object, np.int64, np.int64, object, object]
+# already-compressed formats go into backups as ZIP_STORED; deflating them only burns CPU
+STORED_EXTS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".gif"})
+# columns an import file must provide, in insert order (image_path is left empty)
+IMPORT_COLS = ["make", "model", "year", "price", "color", "type", "condition", "drive_trains", "engine_power", "liter_capacity", "salesperson"]
+IMPORT_INT_COLS = ("year", "engine_power", "liter_capacity")
+# text columns are read as strings up front; numeric ones are coerced in prepare_import so bad cells fail per row
+IMPORT_DTYPES = {c: "string" for c in IMPORT_COLS if c not in IMPORT_INT_COLS and c != "price"}
+IMPORT_CHUNK = 10_000  # rows validated + inserted per transaction; bounds peak memory on big files
+CAR_INSERT_COLS = "make, model, year, price, color, type, condition, drive_trains, engine_power, liter_capacity, salesperson, image_path"
+CAR_COLUMNS = frozenset(CAR_INSERT_COLS.split(", "))
+INSERT_ROWS_PER_STMT = 999 // 12  # VALUES tuples per bulk INSERT; stays under SQLite's old 999-parameter cap
+# single-car PDF sheet: "<field>_lbl" slots take translated labels, the rest take the car's values
+PDF_LABELS = ("price", "color", "type", "condition", "drive_trains", "engine_power", "liter_capacity", "salesperson")
+PDF_TEMPLATE = """
+<html><body>
+<h2>{make} {model} ({year})</h2>
+{img_html}
+<p><b>{price_lbl}:</b> {price}</p>
+<p><b>{color_lbl}:</b> {color} &nbsp; <b>{type_lbl}:</b> {type}</p>
+<p><b>{condition_lbl}:</b> {condition} &nbsp; <b>{drive_trains_lbl}:</b> {drive_trains}</p>
+<p><b>{engine_power_lbl}:</b> {engine_power} &nbsp; <b>{liter_capacity_lbl}:</b> {liter_capacity}</p>
+<p><b>{salesperson_lbl}:</b> {salesperson}</p>
+</body></html>
+"""
 
 
 # --------- Utilities ---------
+@lru_cache(maxsize=None)
+def car_insert_sql(n):
+    """INSERT for `n` car rows in one statement; only two sizes are ever built per import (full + tail)."""
+    return f"INSERT INTO cars ({CAR_INSERT_COLS}) VALUES " + ",".join(["(?,?,?,?,?,?,?,?,?,?,?,?)"] * n)
+
+
+@lru_cache(maxsize=64)
+def car_update_sql(fields):
+    """UPDATE for a sorted tuple of column names, so one column set is always one cached statement."""
+    bad = set(fields) - CAR_COLUMNS
+    if bad: raise ValueError(f"unknown car column(s): {', '.join(sorted(bad))}")
+    return f"UPDATE cars SET {', '.join(f'{k}=?' for k in fields)} WHERE id=?"
+
+
+def column_array(values, dtype):
+    """Typed column when every value fits (no NULLs/stray text), else an object column."""
+    if dtype is np.int64 and all(type(v) is int for v in values):
+        return np.array(values, dtype=np.int64)
+    if dtype is np.float64 and all(type(v) in (int, float) for v in values):
+        return np.array(values, dtype=np.float64)
+    arr = np.empty(len(values), dtype=object); arr[:] = values
+    return arr
+
+
+@lru_cache(maxsize=None)
+def optional_module(name):
+    """Import a heavy or optional dependency on first use; None when it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
+def iter_import_frames(fp, chunk=IMPORT_CHUNK):
+    """Yield an import file as DataFrames of at most `chunk` rows, holding only IMPORT_COLS.
+
+    Always yields at least one (possibly empty) frame so callers can check the columns.
+    """
+    import pandas as pd
+    if fp.lower().endswith(".csv"):
+        # The C parser stays: its chunked reader beat a pyarrow.csv streaming reader on a 300k-row file,
+        # and engine="pyarrow" cannot chunk.
+        yield from pd.read_csv(fp, usecols=lambda c: c in IMPORT_COLS, dtype=IMPORT_DTYPES, chunksize=chunk)
+        return
+    openpyxl = optional_module("openpyxl")
+    if openpyxl is None:  # no openpyxl streaming: fall back to reading the sheet at once
+        yield pd.read_excel(fp, usecols=lambda c: c in IMPORT_COLS, dtype=IMPORT_DTYPES)
+        return
+    wb = openpyxl.load_workbook(fp, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = ["" if h is None else str(h) for h in next(rows, ())]
+        keep = [i for i, h in enumerate(header) if h in IMPORT_COLS]; names = [header[i] for i in keep]
+        dtypes = {c: t for c, t in IMPORT_DTYPES.items() if c in names}
+        batch = []; sent = False
+        for row in rows:
+            if all(v is None for v in row): continue  # blank rows, as read_excel drops them
+            batch.append([row[i] if i < len(row) else None for i in keep])
+            if len(batch) >= chunk:
+                yield pd.DataFrame(batch, columns=names).astype(dtypes); batch = []; sent = True
+        if batch or not sent:
+            yield pd.DataFrame(batch, columns=names).astype(dtypes)
+    finally:
+        wb.close()
+
+
+def write_xlsx(fp, headers, rows):
+    """Stream rows into an .xlsx without building the sheet in memory.
+
+    Uses xlsxwriter's constant_memory mode, else openpyxl's write-only workbook,
+    else a DataFrame as the last resort.
+    """
+    xlsxwriter, openpyxl = optional_module("xlsxwriter"), optional_module("openpyxl")
+    if xlsxwriter is not None:
+        wb = xlsxwriter.Workbook(fp, {"constant_memory": True})
+        try:
+            ws = wb.add_worksheet(); ws.write_row(0, 0, headers)
+            for i, row in enumerate(rows, 1): ws.write_row(i, 0, tuple(row))
+        finally:
+            wb.close()
+    elif openpyxl is not None:
+        wb = openpyxl.Workbook(write_only=True); ws = wb.create_sheet(); ws.append(headers)
+        for row in rows: ws.append(tuple(row))
+        wb.save(fp)
+    else:
+        import pandas as pd
+        pd.DataFrame([tuple(r) for r in rows], columns=headers).to_excel(fp, index=False)
+
+
+def prepare_import(df):
+    """Validate an import frame column-wise.
+
+    Returns (insert tuples for the valid rows, number of rejected rows).
+    """
+    import pandas as pd
+    cols = {}
+    for c in IMPORT_COLS:
+        if c == "price": cols[c] = pd.to_numeric(df[c], errors="coerce")
+        elif c in IMPORT_INT_COLS: cols[c] = np.trunc(pd.to_numeric(df[c], errors="coerce"))  # int() semantics
+        else: cols[c] = df[c].astype("string").str.strip()
+    valid = (
+        cols["year"].between(1886, 2050) & (cols["price"] > 0) & (cols["engine_power"] > 0) & (cols["liter_capacity"] > 0)
+        & cols["type"].isin(ENUM_TYPES) & cols["condition"].isin(ENUM_CONDITIONS) & cols["drive_trains"].isin(ENUM_DRIVES)
+    )
+    for c in TEXT_REQUIRED: valid &= cols[c].str.len().gt(0).fillna(False)
+    valid = valid.to_numpy(dtype=bool)
+    out = []
+    for c in IMPORT_COLS:
+        v = cols[c][valid]
+        out.append(v.astype(np.int64).tolist() if c in IMPORT_INT_COLS else v.astype(float).tolist() if c == "price" else v.tolist())
+    rows = [t + ("",) for t in zip(*out)]
+    return rows, len(df) - len(rows)
+
+
+@lru_cache(maxsize=4096)
 def format_price(value, lang):
     if isinstance(value, (int, float)):
         if babel_format_currency:
@@ -86,6 +232,7 @@ def format_price(value, lang):
     return str(value)
 
 
+@lru_cache(maxsize=None)
 def std_icon(sp):
     try:
         return QApplication.style().standardIcon(sp)
@@ -93,25 +240,89 @@ def std_icon(sp):
         return QIcon()
 
 
-def bytes_from_image_path(path, max_width=400):
+def scan_files(root):
+    """[(path, size)] for every file under root; scandir entries carry their type, so dirs cost no stat."""
+    out, stack = [], [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False): stack.append(e.path)
+                elif e.is_file(): out.append((e.path, e.stat().st_size))
+    return out
+
+
+def remove_file(path):
+    """Best-effort delete; one unlink syscall instead of exists() + remove()."""
+    if not path: return
     try:
-        pm = QPixmap(path)
-        if pm.isNull():
-            return None
-        if pm.width() > max_width:
-            pm = pm.scaledToWidth(max_width, Qt.SmoothTransformation)
-        ba = QByteArray()
-        buf = QBuffer(ba)
-        buf.open(QIODevice.WriteOnly)
-        pm.save(buf, "PNG")
-        buf.close()
-        return bytes(ba)
-    except Exception:
-        return None
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def load_thumbnail(path, w, h):
+    """Thumbnail decoded straight at (w, h) by QImageReader; cached per (path, mtime, size)."""
+    try:
+        key = f"thumb|{path}|{os.path.getmtime(path)}|{w}x{h}"
+    except OSError:
+        return QPixmap()
+    pm = QPixmap()
+    if QPixmapCache.find(key, pm):
+        return pm
+    reader = QImageReader(path); reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid():
+        reader.setScaledSize(size.scaled(w, h, Qt.KeepAspectRatio))  # JPEG decodes at 1/2..1/8 directly
+    img = reader.read()
+    if img.isNull():
+        return QPixmap()
+    pm = QPixmap.fromImage(img); QPixmapCache.insert(key, pm)
+    return pm
+
+
+THUMB_DIR = os.path.join("car_images", ".thumb")
+
+
+def thumb_path(path):
+    """Sidecar preview for a stored image: car_images/.thumb/<name>.jpg."""
+    return os.path.join(THUMB_DIR, os.path.splitext(os.path.basename(path))[0] + ".jpg")
+
+
+def write_thumbnail(path, w=560, h=480):
+    """Pre-decode a stored image into its JPEG sidecar; QImage only, so safe off the GUI thread."""
+    reader = QImageReader(path); reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and (size.width() > w or size.height() > h):
+        reader.setScaledSize(size.scaled(w, h, Qt.KeepAspectRatio))
+    img = reader.read()
+    if img.isNull(): return ""
+    os.makedirs(THUMB_DIR, exist_ok=True); dst = thumb_path(path)
+    return dst if img.save(dst, "JPG", 80) else ""
+
+
+def remove_stored_image(path):
+    """Delete a stored car image together with its thumbnail sidecar."""
+    if not path: return
+    remove_file(path); remove_file(thumb_path(path))
+
+
+@lru_cache(maxsize=8)
+def placeholder_pixmap(w, h, dark, lang):
+    pm = QPixmap(w, h); pm.fill(QColor(60, 60, 60) if dark else QColor(240, 240, 240))
+    p = QPainter(pm); p.setPen(QColor(200, 200, 200) if dark else QColor(120, 120, 120))
+    f = QFont(); f.setPointSize(10); f.setBold(True); p.setFont(f)
+    p.drawText(pm.rect(), Qt.AlignCenter, "No Image" if lang == "en" else "لا توجد صورة"); p.end()
+    return pm
 
 
 # --------- Translator & Database ---------
 class Translator:
+    _cache = {}  # filename -> parsed JSON, shared so toggling languages never re-reads a file
+
     def __init__(self, lang="en"):
         self.lang = lang
         self.translations = self.load_translations()
@@ -120,17 +331,24 @@ class Translator:
         filename = f"{self.lang}.json"
         if not os.path.exists(filename):
             filename = "en.json"
-        with open(filename, "r", encoding="utf-8") as f:
-            return json.load(f)
+        cached = Translator._cache.get(filename)
+        if cached is None:
+            with open(filename, "r", encoding="utf-8") as f:
+                cached = Translator._cache[filename] = json.load(f)
+        return cached
 
-    def t(self, key):
-        return self.translations.get(key, key)
+    def t(self, key, default=None):
+        """Translated text for key; falls back to `default`, else the key itself."""
+        return self.translations.get(key, key if default is None else default)
 
 
 class Database:
     def __init__(self, db_file="car_sales.db"):
         self.db_file = os.path.abspath(db_file)
-        self.conn = sqlite3.connect(self.db_file)
+        # autocommit; multi-statement writes group themselves with transaction()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None, cached_statements=256)
+        self.conn.row_factory = sqlite3.Row
+        self._read_cache = {}  # search (query, args) -> rows; emptied by every write to cars
         self._apply_pragmas()
         self.create_tables()
         self._migrate_schema()
@@ -142,6 +360,9 @@ class Database:
             self.conn.execute("PRAGMA foreign_keys = ON;")
             self.conn.execute("PRAGMA journal_mode = WAL;")
             self.conn.execute("PRAGMA synchronous = NORMAL;")
+            self.conn.execute("PRAGMA temp_store = MEMORY;")
+            self.conn.execute("PRAGMA cache_size = -65536;")
+            self.conn.execute("PRAGMA mmap_size = 268435456;")
         except sqlite3.Error:
             pass
 
@@ -194,6 +415,10 @@ class Database:
             self._exec("CREATE INDEX IF NOT EXISTS idx_cars_price ON cars(price);")
             self._exec("CREATE INDEX IF NOT EXISTS idx_cars_condition ON cars(condition);")
             self._exec("CREATE INDEX IF NOT EXISTS idx_cars_drive ON cars(drive_trains);")
+            self._exec("CREATE INDEX IF NOT EXISTS idx_cars_cond_drive ON cars(condition, drive_trains);")
+            # the make filter is a substring LIKE, which no index can serve; drop the old NOCASE one
+            self._exec("DROP INDEX IF EXISTS idx_cars_make_nocase;")
+            self._exec("CREATE INDEX IF NOT EXISTS idx_car_images_car ON car_images(car_id);")
         except sqlite3.Error:
             pass
 
@@ -203,28 +428,48 @@ class Database:
         print("[DB] cars columns:", cols)
 
     def _exec(self, q, p=None):
-        cur = self.conn.cursor()
-        cur.execute(q, p or [])
-        self.conn.commit()
-        return cur
+        return self.conn.execute(q, p or [])
+
+    def _cached_rows(self, key, q, p=None):
+        """fetchall() of a read, reused until the next write to cars; treat the list as read-only."""
+        rows = self._read_cache.get(key)
+        if rows is None:
+            if len(self._read_cache) >= 32: self._read_cache.clear()
+            rows = self._read_cache[key] = self._exec(q, p).fetchall()
+        return rows
+
+    def _cars_changed(self):
+        self._read_cache.clear()
+
+    @contextmanager
+    def transaction(self):
+        # IMMEDIATE takes the write lock up front instead of upgrading mid-batch
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK"); raise
+        self.conn.execute("COMMIT")
 
     # CRUD
     def insert_car(self, car_tuple):
-        q = """
-        INSERT INTO cars
-        (make, model, year, price, color, type, condition, drive_trains,
-         engine_power, liter_capacity, salesperson, image_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        cur = self._exec(q, car_tuple)
+        cur = self._exec(car_insert_sql(1), car_tuple); self._cars_changed()
         return cur.lastrowid
 
+    def insert_cars_bulk(self, rows):
+        """Insert many car tuples (any iterable, e.g. a generator) in one transaction; returns the number inserted.
+
+        Rows go in INSERT_ROWS_PER_STMT at a time as multi-VALUES statements, which
+        parses/steps far fewer statements than a row-per-step executemany.
+        """
+        it = iter(rows); n = 0
+        with self.transaction() as conn:
+            while batch := list(islice(it, INSERT_ROWS_PER_STMT)):
+                conn.execute(car_insert_sql(len(batch)), list(chain.from_iterable(batch))); n += len(batch)
+        self._cars_changed()
+        return n
+
     def add_car(self, car_dict: dict):
-        fields = [
-            "make", "model", "year", "price", "color",
-            "type", "condition", "drive_trains",
-            "engine_power", "liter_capacity", "salesperson", "image_path"
-        ]
         values = [
             car_dict.get("make", ""), car_dict.get("model", ""), car_dict.get("year"),
             car_dict.get("price"), car_dict.get("color", ""), car_dict.get("type", ""),
@@ -232,13 +477,30 @@ class Database:
             car_dict.get("engine_power"), car_dict.get("liter_capacity"),
             car_dict.get("salesperson", ""), car_dict.get("image_path", "")
         ]
-        q = f"INSERT INTO cars ({', '.join(fields)}) VALUES ({', '.join(['?']*len(fields))})"
-        cur = self._exec(q, values)
+        cur = self._exec(car_insert_sql(1), values); self._cars_changed()
         return cur.lastrowid
 
     def fetch_all_cars(self):
         return self._exec("SELECT * FROM cars").fetchall()
 
+    def iter_cars(self):
+        """Yield car rows straight off a cursor, for scans that don't need a list."""
+        cur = self.conn.cursor(); cur.arraysize = 1000
+        cur.execute("SELECT * FROM cars")
+        yield from cur
+
+    def count_cars(self):
+        return self._exec("SELECT COUNT(*) FROM cars").fetchone()[0]
+
+    def analytics_summary(self):
+        """(total cars, average price) computed by SQLite."""
+        total, avg = self._exec("SELECT COUNT(*), AVG(price) FROM cars").fetchone()
+        return total, avg or 0.0
+
+    def counts_by_make(self):
+        """[(make, count)] in order of each make's first appearance."""
+        return [tuple(r) for r in self._exec("SELECT make, COUNT(*) FROM cars GROUP BY make ORDER BY MIN(id)").fetchall()]
+
     def fetch_car_by_id(self, car_id):
         return self._exec("SELECT * FROM cars WHERE id=?", (car_id,)).fetchone()
 
@@ -247,7 +509,9 @@ class Database:
         q = "SELECT * FROM cars WHERE 1=1 "
         p = []
         if make:
-            q += "AND make LIKE ? "; p.append(f"%{make}%")
+            # substring match on the literal text (%, _ and \ typed by the user are escaped)
+            esc = make.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            q += "AND make LIKE ? ESCAPE '\\' "; p.append(f"%{esc}%")
         if year_min is not None:
             q += "AND year >= ? "; p.append(year_min)
         if year_max is not None:
@@ -260,22 +524,34 @@ class Database:
             q += "AND condition = ? "; p.append(condition)
         if drive_trains and drive_trains != "Any":
             q += "AND drive_trains = ? "; p.append(drive_trains)
-        return self._exec(q, p).fetchall()
+        return self._cached_rows((q, tuple(p)), q, p)
 
     def update_car(self, car_id, updates: dict):
         if not updates:
             return
-        set_clause = ", ".join(f"{k}=?" for k in updates.keys())
-        p = list(updates.values()) + [car_id]
-        self._exec(f"UPDATE cars SET {set_clause} WHERE id=?", p)
+        fields = tuple(sorted(updates))
+        self._exec(car_update_sql(fields), [updates[k] for k in fields] + [car_id]); self._cars_changed()
 
     def delete_car(self, car_id):
-        self._exec("DELETE FROM cars WHERE id=?", (car_id,))
+        self._exec("DELETE FROM cars WHERE id=?", (car_id,)); self._cars_changed()
+
+    def delete_cars(self, car_ids):
+        """Delete many cars in one transaction (IN lists of up to 999 ids, SQLite's bound-variable limit)."""
+        it = iter(car_ids)
+        with self.transaction() as conn:
+            while batch := list(islice(it, 999)):
+                conn.execute(f"DELETE FROM cars WHERE id IN ({','.join('?' * len(batch))})", batch)
+        self._cars_changed()
 
     # extra images
     def add_image(self, car_id, path):
         self._exec("INSERT INTO car_images (car_id, path) VALUES (?, ?)", (car_id, path))
 
+    def add_images(self, car_id, paths):
+        with self.transaction() as conn:
+            conn.executemany("INSERT INTO car_images (car_id, path) VALUES (?, ?)",
+                                  [(car_id, p) for p in paths])
+
     def fetch_images(self, car_id):
         return self._exec("SELECT id, path FROM car_images WHERE car_id=?", (car_id,)).fetchall()
 
@@ -295,27 +571,124 @@ class CarTableModel(QAbstractTableModel):
         super().__init__(parent)
         self.translator = translator
         self.db = db
-        self._data = cars if cars is not None else self.db.fetch_all_cars()
         self.highlight_query = ""
+        self._hi_mask = None; self._hi_color = None
+        self._lower_rows = None  # lowercase displayed text per row, built on first filter
+        self._rebuild_headers()
+        self._set_rows(self._first_rows(cars))
+
+    def _first_rows(self, cars):
+        # explicit rows (search results) or the whole table: the quick filter, sorting and the
+        # status-bar aggregates all work on the model, so it always holds every row
+        return cars if cars is not None else self.db.fetch_all_cars()
+
+    def _set_rows(self, cars):
+        # struct-of-arrays: one NumPy column per cars field instead of a list of row tuples
+        cols = list(zip(*cars)) if cars else [()] * len(COL_DTYPES)
+        self._cols = [column_array(list(v), dt) for v, dt in zip(cols, COL_DTYPES)]
+        self._n = len(cars)
+        self._lower_rows = None
+        self._rebuild_price_cache(); self._rebuild_highlight()
+
+    def _rebuild_headers(self):
+        self._headers = [k if k == "ID" else self.translator.t(k) for k in HEADER_KEYS]
+
+    def _rebuild_price_cache(self):
+        # formatted price per row, so painting column 4 never calls babel
+        lang = self.translator.lang
+        self._price_cache = column_array([format_price(v, lang) for v in self._cols[4].tolist()], object)
+
+    def _row_texts(self, rows):
+        cols = [self._price_cache[rows] if c == 4 else self._cols[c][rows].astype(str) for c in DISPLAY_COLS]
+        return column_array(["\n".join(t).lower() for t in zip(*cols)], object)
+
+    def matches(self, row, query):
+        if self._lower_rows is None:
+            self._lower_rows = self._row_texts(slice(None))
+        return query in self._lower_rows[row]
+
+    def _rebuild_highlight(self):
+        # (rows x cols) match mask for the highlight query; BackgroundRole becomes a lookup
+        q = self.highlight_query
+        self._hi_mask = np.column_stack([
+            np.char.find(np.char.lower(self._cols[c].astype(str)), q) >= 0 for c in DISPLAY_COLS
+        ]) if q and self._n else None
 
     def set_highlight_query(self, q):
         self.highlight_query = (q or "").lower().strip()
+        dark = QApplication.instance().palette().color(QPalette.Window).value() < 128
+        self._hi_color = QColor(60, 80, 140, 80) if dark else QColor(180, 205, 255, 120)
+        self._rebuild_highlight()
         if self.rowCount():
             self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount()-1, self.columnCount()-1), [Qt.BackgroundRole])
 
     def update_translator(self, translator: Translator):
         self.translator = translator
-        self.headerDataChanged.emit(Qt.Horizontal, 0, self.columnCount()-1)
-        if self.rowCount():
-            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount()-1, self.columnCount()-1), [Qt.DisplayRole])
+        self._rebuild_headers(); self.headerDataChanged.emit(Qt.Horizontal, 0, self.columnCount()-1)
+        old = self._price_cache; self._rebuild_price_cache()
+        # only the price text depends on the language; signal just the rows whose text changed, one range per run
+        changed = np.flatnonzero(old != self._price_cache)
+        if changed.size:
+            self._lower_rows = None
+            for run in np.split(changed, np.flatnonzero(np.diff(changed) > 1) + 1):
+                self.dataChanged.emit(self.index(int(run[0]), 4), self.index(int(run[-1]), 4), [Qt.DisplayRole])
 
     def load_data(self, cars=None):
         self.beginResetModel()
-        self._data = cars if cars is not None else self.db.fetch_all_cars()
+        self._set_rows(self._first_rows(cars))
         self.endResetModel()
 
+    def _append_rows(self, rows):
+        lang = self.translator.lang
+        self.beginInsertRows(QModelIndex(), self._n, self._n + len(rows) - 1)
+        self._cols = [np.concatenate([c, column_array(list(v), dt)]) for c, v, dt in zip(self._cols, zip(*rows), COL_DTYPES)]
+        self._price_cache = np.concatenate([self._price_cache, column_array([format_price(r[4], lang) for r in rows], object)])
+        if self._lower_rows is not None:
+            self._lower_rows = np.concatenate([self._lower_rows, self._row_texts(slice(self._n, None))])
+        self._n += len(rows); self._rebuild_highlight()
+        self.endInsertRows()
+
+    def _set_cell(self, row, c, v):
+        arr = self._cols[c]
+        if (arr.dtype == np.int64 and type(v) is not int) or (arr.dtype == np.float64 and type(v) not in (int, float)):
+            arr = self._cols[c] = arr.astype(object)  # NULL / stray type: fall back to an object column
+        arr[row] = v
+
+    # --- partial refresh: touch only the affected row instead of load_data() ---
+    def insert_row(self, car_id):
+        rec = self.db.fetch_car_by_id(car_id)
+        if rec: self._append_rows([tuple(rec)])
+
+    def update_row(self, car_id):
+        row = self.row_of_id(car_id); rec = self.db.fetch_car_by_id(car_id) if row != -1 else None
+        if rec is None: return
+        for c, v in enumerate(rec): self._set_cell(row, c, v)
+        self._price_cache[row] = format_price(rec[4], self.translator.lang)
+        if self._lower_rows is not None: self._lower_rows[row] = self._row_texts(slice(row, row + 1))[0]
+        if self._hi_mask is not None:
+            self._hi_mask[row] = [self.highlight_query in str(rec[c]).lower() for c in DISPLAY_COLS]
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount()-1), [Qt.DisplayRole])
+
+    def remove_rows(self, car_ids):
+        rows = np.flatnonzero(np.isin(self._cols[0], list(car_ids)))
+        if not rows.size: return
+        # one contiguous block -> a plain row removal; scattered rows -> one reset instead of a signal per row
+        contiguous = rows[-1] - rows[0] + 1 == rows.size
+        if contiguous: self.beginRemoveRows(QModelIndex(), int(rows[0]), int(rows[-1]))
+        else: self.beginResetModel()
+        self._cols = [np.delete(c, rows) for c in self._cols]
+        self._price_cache = np.delete(self._price_cache, rows)
+        if self._lower_rows is not None: self._lower_rows = np.delete(self._lower_rows, rows)
+        if self._hi_mask is not None: self._hi_mask = np.delete(self._hi_mask, rows, axis=0)
+        self._n -= rows.size
+        if contiguous: self.endRemoveRows()
+        else: self.endResetModel()
+
+    def total_rows(self):
+        return self._n
+
     def rowCount(self, parent=QModelIndex()):
-        return 0 if parent.isValid() else len(self._data)
+        return 0 if parent.isValid() else self._n
 
     def columnCount(self, parent=QModelIndex()):
         return 0 if parent.isValid() else len(DISPLAY_COLS)
@@ -324,36 +697,28 @@ class CarTableModel(QAbstractTableModel):
         if not index.isValid():
             return None
         row, col = index.row(), index.column()
-        value = self._data[row][DISPLAY_COLS[col]]
+        value = self._cols[DISPLAY_COLS[col]][row]
 
         if role == Qt.DisplayRole:
-            if col == 4 and isinstance(value, (int, float)):
-                return format_price(value, self.translator.lang)
+            if col == 4:
+                return self._price_cache[row]
             return str(value)
 
         if role == Qt.TextAlignmentRole:
-            if col in (1, 2, 5, 6, 7, 8, 11):
-                return Qt.AlignVCenter | Qt.AlignLeft
-            return Qt.AlignVCenter | Qt.AlignRight
+            return COL_ALIGN[col]
 
         if role == Qt.ToolTipRole:
             return str(value)
 
-        if role == Qt.BackgroundRole and self.highlight_query:
-            try:
-                if self.highlight_query in str(value).lower():
-                    dark = QApplication.instance().palette().color(QPalette.Window).value() < 128
-                    return QColor(60, 80, 140, 80) if dark else QColor(180, 205, 255, 120)
-            except Exception:
-                pass
+        if role == Qt.BackgroundRole and self._hi_mask is not None:
+            return self._hi_color if self._hi_mask[row, col] else None
         return None
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
             return None
         if orientation == Qt.Horizontal:
-            key = HEADER_KEYS[section]
-            return self.translator.t(key) if key != "ID" else "ID"
+            return self._headers[section]
         return str(section+1)
 
     def flags(self, index):
@@ -370,8 +735,7 @@ class CarTableModel(QAbstractTableModel):
         row, col = index.row(), index.column()
         if col == 0:
             return False
-        car = self._data[row]
-        car_id = car[0]
+        car_id = int(self._cols[0][row])
         field = FIELD_MAP.get(col)
         if not field:
             return False
@@ -385,57 +749,107 @@ class CarTableModel(QAbstractTableModel):
                 if v <= 0: return False
             else:
                 v = s
-                if field == "type" and v not in ENUM_TYPES: return False
-                if field == "condition" and v not in ENUM_CONDITIONS: return False
-                if field == "drive_trains" and v not in ENUM_DRIVES: return False
-                if field in {"make", "model", "color", "salesperson"} and not v: return False
+                if field == "type" and v not in ENUM_TYPES_SET: return False
+                if field == "condition" and v not in ENUM_CONDITIONS_SET: return False
+                if field == "drive_trains" and v not in ENUM_DRIVES_SET: return False
+                if field in TEXT_REQUIRED and not v: return False
             self.db.update_car(car_id, {field: v})
-            row_list = list(self._data[row]); row_list[col] = v
-            self._data[row] = tuple(row_list)
+            self._set_cell(row, col, v)
+            if self._hi_mask is not None: self._hi_mask[row, col] = self.highlight_query in str(v).lower()
+            if col == 4: self._price_cache[row] = format_price(v, self.translator.lang)
+            if self._lower_rows is not None: self._lower_rows[row] = self._row_texts(slice(row, row + 1))[0]
             self.dataChanged.emit(index, index, [Qt.DisplayRole])
             return True
         except Exception:
             return False
 
     def sort(self, column, order):
-        reverse = order == Qt.DescendingOrder
-        idx = DISPLAY_COLS[column]
-        def key_fn(rec):
-            v = rec[idx]
-            if column in NUMERIC_COLS:
-                try: return float(v)
-                except Exception: return float("inf")
-            return str(v).lower()
+        if not self._n: return
+        col_vals = self._cols[DISPLAY_COLS[column]]
+        # one vectorized key column instead of a Python key call per row
+        if column in NUMERIC_COLS and col_vals.dtype != object:
+            keys = col_vals
+        elif column in NUMERIC_COLS:  # NULLs/stray text: coerce, sort them last
+            import pandas as pd
+            keys = pd.to_numeric(pd.Series(col_vals), errors="coerce").fillna(np.inf).to_numpy()
+        else:
+            keys = np.char.lower(col_vals.astype(str))
+        if order == Qt.DescendingOrder:
+            # stable descending (ties keep their current order), like list.sort(reverse=True)
+            n = len(keys); perm = (n - 1 - np.argsort(keys[::-1], kind="stable"))[::-1]
+        else:
+            perm = np.argsort(keys, kind="stable")
         self.layoutAboutToBeChanged.emit()
-        self._data.sort(key=key_fn, reverse=reverse)
+        self._cols = [c[perm] for c in self._cols]
+        self._price_cache = self._price_cache[perm]
+        if self._hi_mask is not None: self._hi_mask = self._hi_mask[perm]
+        if self._lower_rows is not None: self._lower_rows = self._lower_rows[perm]
         self.layoutChanged.emit()
 
     def get_row(self, row):
-        return self._data[row] if 0 <= row < len(self._data) else None
+        # item() hands back plain Python values, which sqlite3 can bind
+        return tuple(c.item(row) for c in self._cols) if 0 <= row < self._n else None
+
+    def column_text(self, col, rows):
+        """DisplayRole text of `col` for the given source rows, pulled from the column in one go."""
+        rows = np.asarray(rows, dtype=np.intp)
+        vals = self._price_cache[rows] if col == 4 else self._cols[DISPLAY_COLS[col]][rows].astype(str)
+        return vals.tolist()
+
+    def price_values(self, rows):
+        """Numeric prices of the given source rows as a float64 array (NULL/non-numeric skipped)."""
+        col = self._cols[4][np.asarray(rows, dtype=np.intp)]
+        if col.dtype == object:
+            col = np.fromiter((v for v in col if isinstance(v, (int, float))), dtype=np.float64)
+        return col
+
+    def row_text(self, row):
+        """DisplayRole text of one source row; the price comes from the per-row cache, not babel."""
+        texts = [str(c.item(row)) for c in self._cols[:len(DISPLAY_COLS)]]
+        texts[4] = self._price_cache[row]; return texts
+
+    def row_of_id(self, car_id):
+        hits = np.flatnonzero(self._cols[0] == car_id)
+        return int(hits[0]) if hits.size else -1
 
 
 class CarFilterProxy(QSortFilterProxyModel):
+    """Quick filter: a plain substring test against the model's cached lower-case row text; no regex involved."""
+    QUERY_DELAY_MS = 150
+    queryApplied = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.query = ""
+        self._pending = ""
+        # typing bursts collapse into one filter pass once input pauses
+        self._timer = QTimer(self); self._timer.setSingleShot(True); self._timer.timeout.connect(self._apply)
+
+    def setQuery(self, text, delay_ms=None):
+        self._pending = (text or "").lower().strip()
+        if self._pending == self.query:  # e.g. only case/whitespace changed: nothing to re-filter
+            self._timer.stop(); return
+        delay = self.QUERY_DELAY_MS if delay_ms is None else delay_ms
+        if delay <= 0:
+            self._timer.stop(); self._apply()
+        else:
+            self._timer.start(delay)
 
-    def setQuery(self, text):
-        self.query = (text or "").lower().strip()
+    def _apply(self):
+        self.query = self._pending
         self.invalidateFilter()
         src = self.sourceModel()
         if hasattr(src, "set_highlight_query"):
             src.set_highlight_query(self.query)
+        self.queryApplied.emit()
+
+    def visible_source_rows(self):
+        return [self.mapToSource(self.index(r, 0)).row() for r in range(self.rowCount())]
 
     def filterAcceptsRow(self, src_row, src_parent):
         if not self.query:
             return True
-        m = self.sourceModel()
-        for c in range(m.columnCount()):
-            idx = m.index(src_row, c, src_parent)
-            val = m.data(idx, Qt.DisplayRole)
-            if val and self.query in str(val).lower():
-                return True
-        return False
+        return self.sourceModel().matches(src_row, self.query)
 
 
 from PySide6.QtWidgets import QStyledItemDelegate
@@ -480,9 +894,11 @@ class InlineDelegate(QStyledItemDelegate):
 
 # --------- Drop-enabled label ---------
 class ImageDropLabel(QLabel):
-    def __init__(self, parent=None, on_drop=None, tooltip_text=""):
+    MAX_DOWNLOAD = 20 * 1024 * 1024  # bytes
+
+    def __init__(self, parent=None, on_drop=None, on_drop_url=None, tooltip_text=""):
         super().__init__(parent)
-        self.on_drop = on_drop
+        self.on_drop = on_drop; self.on_drop_url = on_drop_url  # on_drop_url downloads off the GUI thread
         self.setAcceptDrops(True)
         if tooltip_text:
             self.setToolTip(tooltip_text)
@@ -502,24 +918,80 @@ class ImageDropLabel(QLabel):
         for url in event.mimeData().urls():
             u = url.toString()
             if u.startswith("http"):
-                if requests is None:
+                if optional_module("requests") is None:
                     QMessageBox.warning(self, "Info", "Install 'requests' to drop images from web.")
                     continue
-                try:
-                    r = requests.get(u, timeout=10)
-                    if r.ok:
-                        pm = QPixmap(); pm.loadFromData(r.content)
-                        if not pm.isNull():
-                            temp_path = os.path.join(os.getcwd(), f"dropped_{uuid4().hex}.png")
-                            pm.save(temp_path, "PNG")
-                            if callable(self.on_drop): self.on_drop(temp_path); return
-                except Exception: pass
+                if callable(self.on_drop_url): self.on_drop_url(u); event.acceptProposedAction(); return
             else:
                 p = url.toLocalFile()
                 if p and os.path.splitext(p.lower())[1] in (".png", ".jpg", ".jpeg", ".bmp"):
                     if callable(self.on_drop): self.on_drop(p); return
         event.ignore()
 
+    @classmethod
+    def _download(cls, url):
+        # stream into one buffer and give up past MAX_DOWNLOAD instead of buffering any size
+        requests = optional_module("requests")
+        with requests.get(url, timeout=10, stream=True) as r:
+            r.raise_for_status()
+            if int(r.headers.get("Content-Length") or 0) > cls.MAX_DOWNLOAD: raise ValueError("image too large")
+            buf = bytearray()
+            for chunk in r.iter_content(1 << 16):
+                buf += chunk
+                if len(buf) > cls.MAX_DOWNLOAD: raise ValueError("image too large")
+        return buf
+
+    @staticmethod
+    def _web_image_ext(url, data):
+        """File extension for downloaded bytes (sniffed, not decoded), or "" when they are not an image."""
+        buf = QBuffer(); buf.setData(QByteArray(data)); buf.open(QIODevice.ReadOnly)
+        fmt = bytes(QImageReader(buf).format().data()).decode()
+        if not fmt: return ""
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        return ext if ext in (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp") else (".jpg" if fmt == "jpeg" else f".{fmt}")
+
+
+class _CopySignals(QObject):
+    done = Signal(int, str, str)  # index, destination, error ("" on success)
+
+
+class CopyTask(QRunnable):
+    """Copies one file (and writes its thumbnail sidecar) on a QThreadPool worker; `signals.done` arrives on the GUI thread."""
+    def __init__(self, index, src, dst):
+        super().__init__()
+        self.index, self.src, self.dst = index, src, dst
+        self.signals = _CopySignals()
+
+    def run(self):
+        try:
+            shutil.copyfile(self.src, self.dst)
+            write_thumbnail(self.dst)
+            self.signals.done.emit(self.index, self.dst, "")
+        except Exception as ex:
+            self.signals.done.emit(self.index, self.dst, str(ex))
+
+
+class _TaskSignals(QObject):
+    done = Signal(object, object, str)  # task, result, error ("" on success)
+    progress = Signal(int)  # percent, for tasks started with progress=True
+
+
+class FuncTask(QRunnable):
+    """Runs fn() on a QThreadPool worker; `signals.done` arrives on the GUI thread.
+
+    With progress=True the callable is given `report(percent)`, which emits `signals.progress`.
+    """
+    def __init__(self, fn, progress=False):
+        super().__init__()
+        self.fn = fn; self.progress = progress
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            self.signals.done.emit(self, self.fn(self.signals.progress.emit) if self.progress else self.fn(), "")
+        except Exception as ex:
+            self.signals.done.emit(self, None, str(ex))
+
 
 # --------- Dialogs ---------
 class CarFormDialog(QDialog):
@@ -569,7 +1041,7 @@ class CarFormDialog(QDialog):
 
         btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         btns.button(QDialogButtonBox.Ok).setText(self.translator.t("submit"))
-        btns.button(QDialogButtonBox.Cancel).setText(self.translator.t("cancel") if "cancel" in self.translator.translations else "Cancel")
+        btns.button(QDialogButtonBox.Cancel).setText(self.translator.t("cancel", "Cancel"))
         btns.accepted.connect(self.accept); btns.rejected.connect(self.reject)
         form.addRow(btns)
 
@@ -617,7 +1089,8 @@ class GalleryDialog(QDialog):
     def __init__(self, translator: Translator, db: Database, car_id: int, parent=None):
         super().__init__(parent)
         self.translator = translator; self.db = db; self.car_id = car_id
-        self.setWindowTitle(self.translator.t("gallery") if "gallery" in self.translator.translations else "Gallery")
+        self._batches = []  # one entry per add_images() click still copying
+        self.setWindowTitle(self.translator.t("gallery", "Gallery"))
         self.resize(640, 420)
         self._build_ui(); self._load_images()
 
@@ -627,9 +1100,9 @@ class GalleryDialog(QDialog):
         self.listw.setIconSize(QSize(140, 120)); self.listw.setResizeMode(QListWidget.Adjust); self.listw.setSpacing(8)
         v.addWidget(self.listw, 1)
         row = QHBoxLayout()
-        b_add = QPushButton(self.translator.t("add") if "add" in self.translator.translations else "Add"); b_add.setIcon(std_icon(QStyle.SP_FileDialogNewFolder))
+        b_add = QPushButton(self.translator.t("add", "Add")); b_add.setIcon(std_icon(QStyle.SP_FileDialogNewFolder))
         b_del = QPushButton(self.translator.t("delete")); b_del.setIcon(std_icon(QStyle.SP_TrashIcon))
-        b_main = QPushButton(self.translator.t("set_as_main") if "set_as_main" in self.translator.translations else "Set as main"); b_main.setIcon(std_icon(QStyle.SP_DialogApplyButton))
+        b_main = QPushButton(self.translator.t("set_as_main", "Set as main")); b_main.setIcon(std_icon(QStyle.SP_DialogApplyButton))
         b_add.clicked.connect(self.add_images); b_del.clicked.connect(self.remove_selected); b_main.clicked.connect(self.set_main)
         row.addWidget(b_add); row.addWidget(b_del); row.addWidget(b_main); row.addStretch(1)
         v.addLayout(row)
@@ -638,8 +1111,9 @@ class GalleryDialog(QDialog):
         self.listw.clear()
         for img_id, path in self.db.fetch_images(self.car_id):
             it = QListWidgetItem(); it.setData(Qt.UserRole, (img_id, path))
-            pm = QPixmap(path)
-            if not pm.isNull(): it.setIcon(QIcon(pm.scaled(140, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)))
+            pm = load_thumbnail(thumb_path(path), 140, 120)  # sidecar first; images added before sidecars existed fall back
+            if pm.isNull(): pm = load_thumbnail(path, 140, 120)
+            if not pm.isNull(): it.setIcon(QIcon(pm))
             it.setText(os.path.basename(path)); self.listw.addItem(it)
 
     def add_images(self):
@@ -647,13 +1121,21 @@ class GalleryDialog(QDialog):
                                                 filter="Image files (*.png *.jpg *.jpeg *.bmp)")
         if not files: return
         os.makedirs("car_images", exist_ok=True)
-        for p in files:
-            try:
-                ext = os.path.splitext(p)[1]; dst = os.path.join("car_images", f"car{self.car_id}_{int(pd.Timestamp.now().timestamp())}{ext}")
-                with open(p, "rb") as s, open(dst, "wb") as d: d.write(s.read())
-                self.db.add_image(self.car_id, dst)
-            except Exception as ex:
-                QMessageBox.warning(self, self.translator.t("warning"), f"{self.translator.t('image_save_fail')}: {ex}")
+        stamp = time.time_ns(); pool = QThreadPool.globalInstance()
+        batch = {"tasks": [], "copies": {}}; self._batches.append(batch)  # per-click state: an earlier batch may still be copying
+        for i, p in enumerate(files):
+            ext = os.path.splitext(p)[1]; dst = os.path.join("car_images", f"car{self.car_id}_{stamp}_{i}{ext}")
+            task = CopyTask(i, p, dst); task.signals.done.connect(lambda index, d, err, b=batch: self._on_copied(b, index, d, err))
+            batch["tasks"].append(task); pool.start(task)
+
+    def _on_copied(self, batch, index, dst, err):
+        if err:
+            QMessageBox.warning(self, self.translator.t("warning"), f"{self.translator.t('image_save_fail')}: {err}")
+        batch["copies"][index] = None if err else dst
+        if len(batch["copies"]) < len(batch["tasks"]): return
+        dsts = [d for _, d in sorted(batch["copies"].items()) if d]  # keep the picked order
+        self._batches.remove(batch)
+        if dsts: self.db.add_images(self.car_id, dsts)  # one transaction for the whole batch
         self._load_images()
 
     def remove_selected(self):
@@ -661,10 +1143,9 @@ class GalleryDialog(QDialog):
         if not it: return
         img_id, path = it.data(Qt.UserRole)
         if QMessageBox.question(self, self.translator.t("confirm"), self.translator.t("confirm_delete")) != QMessageBox.Yes: return
-        try:
-            self.db.delete_image(img_id)
-            if os.path.exists(path): os.remove(path)
+        try: self.db.delete_image(img_id)
         except Exception: pass
+        remove_stored_image(path)
         self._load_images()
 
     def set_main(self):
@@ -673,7 +1154,7 @@ class GalleryDialog(QDialog):
         _, path = it.data(Qt.UserRole)
         try:
             self.db.update_car(self.car_id, {"image_path": path})
-            QMessageBox.information(self, self.translator.t("success"), self.translator.t("image_updated") if "image_updated" in self.translator.translations else "Image updated.")
+            QMessageBox.information(self, self.translator.t("success"), self.translator.t("image_updated", "Image updated."))
             self.accept()
         except Exception as ex:
             QMessageBox.critical(self, self.translator.t("error"), str(ex))
@@ -702,7 +1183,7 @@ class LoginDialog(QDialog):
         self.ed_user = QLineEdit(); self.ed_user.setPlaceholderText("Enter username")
         self.ed_pass = QLineEdit(); self.ed_pass.setEchoMode(QLineEdit.Password); self.ed_pass.setPlaceholderText("Enter password")
         self.cb_show = QCheckBox("Show password"); self.cb_show.toggled.connect(lambda ch: self.ed_pass.setEchoMode(QLineEdit.Normal if ch else QLineEdit.Password))
-        self.cb_remember = QCheckBox(self.translator.t("remember_me") if "remember_me" in self.translator.translations else "Remember me")
+        self.cb_remember = QCheckBox(self.translator.t("remember_me", "Remember me"))
 
         # restore last user
         if self.settings.value("remember_me", False, bool):
@@ -753,22 +1234,37 @@ class Toast(QWidget):
 
 # --------- Main Window ---------
 class MainWindow(QMainWindow):
-    def __init__(self, current_user="admin", current_role="admin", lang="en"):
+    def __init__(self, current_user="admin", current_role="admin", lang="en", db=None):
         super().__init__()
         self.settings = QSettings("YourOrg", "CarSales")
         self.lang = lang
         self.translator = Translator(self.lang)
-        self.db = Database()
+        self.db = db if db is not None else Database()
         self.current_user = current_user
         self.current_role = current_role
+        self._tasks = {}  # FuncTask -> GUI-thread callback(result, error)
+        self._hidden_cols = set()  # mirrors QSettings "hiddenColumns"
+        self._header_menu = None; self._header_actions = {}  # built on first use, dropped on language change
+        self._table_menu = None; self._table_sel_actions = []  # same lifecycle as the header menu
+        # QSettings writes are coalesced and flushed together once changes settle
+        self._settings_dirty = {}
+        self._settings_saved = {}  # key -> value last read from / written to QSettings; equal values are not rewritten
+        self._settings_timer = QTimer(self); self._settings_timer.setSingleShot(True); self._settings_timer.setInterval(300)
+        self._settings_timer.timeout.connect(self._flush_settings)
+        # status-bar aggregates are recomputed once per burst of filter/selection/data changes
+        self._status_timer = QTimer(self); self._status_timer.setSingleShot(True); self._status_timer.setInterval(80)
+        self._status_timer.timeout.connect(self._do_update_status)
 
         self.setWindowTitle("Car Sales Management System (PySide6)")
         self.resize(1280, 780)
 
+        # matplotlib style + charts are rebuilt lazily, the next time the analytics page is shown
+        self._analytics_dirty = True; self._analytics_fp = None  # fingerprint of what the chart currently shows
+        self._bars = None  # BarContainer of the current chart, updated in place when only counts change
+
         self._init_ui()
         self._restore_state()
         self._apply_app_font()
-        self._apply_matplotlib_style()
         self._apply_qss()
         self._apply_shadows()
         self._update_texts()
@@ -781,9 +1277,8 @@ class MainWindow(QMainWindow):
         QShortcut(QKeySequence("Ctrl+F"), self, activated=self._focus_quick_filter)
         QShortcut(QKeySequence("Return"), self, activated=self.edit_selected_car)
         QShortcut(QKeySequence("Ctrl+D"), self, activated=self.duplicate_selected_car)
-        QShortcut(QKeySequence("F5"), self, activated=lambda: (self.model.load_data(), self._update_status()))
+        QShortcut(QKeySequence("F5"), self, activated=self._reload_table)
 
-    def _set_button_icon(self, b, sp): ic = std_icon(sp); 
     def _set_button_icon(self, b, sp):
         ic = std_icon(sp)
         if ic: b.setIcon(ic)
@@ -833,7 +1328,7 @@ class MainWindow(QMainWindow):
         self.btn_dashboard.clicked.connect(lambda: (self.stack.setCurrentWidget(self.page_dashboard), self._set_active_nav(self.btn_dashboard)))
         self.btn_add.clicked.connect(lambda: (self.add_car_dialog(), self._set_active_nav(self.btn_add)))
         self.btn_search.clicked.connect(lambda: (self.stack.setCurrentWidget(self.page_search), self._set_active_nav(self.btn_search)))
-        self.btn_analytics.clicked.connect(lambda: (self._apply_matplotlib_style(), self._refresh_analytics(), self.stack.setCurrentWidget(self.page_analytics), self._set_active_nav(self.btn_analytics)))
+        self.btn_analytics.clicked.connect(self._show_analytics)
         self.btn_import.clicked.connect(self.import_data)
         self.btn_export.clicked.connect(self.export_to_excel)
         self.btn_columns.clicked.connect(self._open_columns_menu)
@@ -859,12 +1354,23 @@ class MainWindow(QMainWindow):
         top = QHBoxLayout()
         self.ed_quick_filter = QLineEdit(); self.ed_quick_filter.setPlaceholderText("Search…")
         self.btn_clear_filter = QToolButton(); self.btn_clear_filter.setIcon(std_icon(QStyle.SP_DialogResetButton))
-        self.btn_clear_filter.clicked.connect(lambda: self.ed_quick_filter.clear())
+        self.btn_clear_filter.clicked.connect(lambda: (self.ed_quick_filter.clear(), self.proxy.setQuery("", 0)))
         top.addWidget(self.ed_quick_filter, 1); top.addWidget(self.btn_clear_filter, 0); lv.addLayout(top)
 
         self.table = QTableView(); self.table.setSortingEnabled(True)
         self.model = CarTableModel(self.translator, self.db)
         self.proxy = CarFilterProxy(self); self.proxy.setSourceModel(self.model)
+        self._visible_row_count = self.proxy.rowCount()  # kept current by the proxy's row signals
+        for sig in (self.proxy.rowsInserted, self.proxy.rowsRemoved, self.proxy.modelReset, self.proxy.layoutChanged):
+            sig.connect(self._recount)
+        for sig in (self.model.modelReset, self.model.rowsInserted, self.model.rowsRemoved):
+            sig.connect(self._mark_analytics_dirty)
+        # the selected source row is mapped once and reused until the selection or row layout changes
+        self._sel_src_row = -1
+        for sig in (self.model.modelReset, self.model.rowsInserted, self.model.rowsRemoved, self.model.layoutChanged,
+                    self.proxy.modelReset, self.proxy.rowsInserted, self.proxy.rowsRemoved, self.proxy.layoutChanged):
+            sig.connect(self._forget_selected_row)
+        self.model.dataChanged.connect(lambda tl, br, roles=(): (not roles or Qt.DisplayRole in roles) and self._mark_analytics_dirty())
         self.table.setModel(self.proxy); self.table.setItemDelegate(InlineDelegate(self.table))
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows); self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table.setTextElideMode(Qt.ElideRight)
@@ -872,7 +1378,10 @@ class MainWindow(QMainWindow):
         self.table.verticalHeader().setDefaultSectionSize(30)
         self.table.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.horizontalHeader().customContextMenuRequested.connect(self._open_header_menu)
-        self.ed_quick_filter.textChanged.connect(lambda t: (self.proxy.setQuery(t), self._update_status()))
+        # typing is debounced inside the proxy; Enter applies the query without waiting
+        self.ed_quick_filter.textChanged.connect(self.proxy.setQuery); self.proxy.queryApplied.connect(self._update_status)
+        self.ed_quick_filter.returnPressed.connect(lambda: self.proxy.setQuery(self.ed_quick_filter.text(), 0))
+        self.table.selectionModel().selectionChanged.connect(self._forget_selected_row)
         self.table.selectionModel().selectionChanged.connect(self._on_table_selection)
         self.table.doubleClicked.connect(self.edit_selected_car)
         self.table.setAlternatingRowColors(True)
@@ -882,8 +1391,9 @@ class MainWindow(QMainWindow):
 
         # Right (preview)
         right = QWidget(); rv = QVBoxLayout(right)
-        gb = QGroupBox(); gb.setTitle(self.translator.t("upload_image")); gb_l = QVBoxLayout(gb)
-        self.lbl_preview_img = ImageDropLabel(on_drop=self._handle_drop_image, tooltip_text=self.translator.t("drop_image_hint") if "drop_image_hint" in self.translator.translations else "Drop image here")
+        gb = self._image_group = QGroupBox(); gb.setTitle(self.translator.t("upload_image")); gb_l = QVBoxLayout(gb)
+        self._retitled_groups = [(gb, "upload_image")]  # walked by _update_texts/_apply_shadows instead of findChildren
+        self.lbl_preview_img = ImageDropLabel(on_drop=self._handle_drop_image, on_drop_url=self._handle_drop_url, tooltip_text=self.translator.t("drop_image_hint", "Drop image here"))
         self.lbl_preview_img.setAlignment(Qt.AlignCenter); self.lbl_preview_img.setMinimumSize(QSize(280, 240)); self.lbl_preview_img.setStyleSheet("border:1px solid #444;")
         gb_l.addWidget(self.lbl_preview_img)
         self.lbl_preview_title = QLabel(); self.lbl_preview_title.setStyleSheet("font-weight:600; font-size:12pt;"); gb_l.addWidget(self.lbl_preview_title, 0, Qt.AlignHCenter)
@@ -901,9 +1411,9 @@ class MainWindow(QMainWindow):
         row = QHBoxLayout()
         b_edit = QPushButton(self.translator.t("edit")); b_edit.setIcon(std_icon(QStyle.SP_FileDialogDetailedView)); b_edit.clicked.connect(self.edit_selected_car)
         b_del = QPushButton(self.translator.t("delete")); b_del.setIcon(std_icon(QStyle.SP_TrashIcon)); b_del.clicked.connect(self.delete_selected_car)
-        b_dup = QPushButton(self.translator.t("duplicate") if "duplicate" in self.translator.translations else "Duplicate"); b_dup.setIcon(std_icon(QStyle.SP_FileDialogNewFolder)); b_dup.clicked.connect(self.duplicate_selected_car)
-        b_gal = QPushButton(self.translator.t("gallery") if "gallery" in self.translator.translations else "Gallery"); b_gal.setIcon(std_icon(QStyle.SP_DirHomeIcon)); b_gal.clicked.connect(self.open_gallery)
-        b_pdf = QPushButton(self.translator.t("export_pdf") if "export_pdf" in self.translator.translations else "Export PDF"); b_pdf.setIcon(std_icon(QStyle.SP_DialogSaveButton)); b_pdf.clicked.connect(self.export_selected_pdf)
+        b_dup = QPushButton(self.translator.t("duplicate", "Duplicate")); b_dup.setIcon(std_icon(QStyle.SP_FileDialogNewFolder)); b_dup.clicked.connect(self.duplicate_selected_car)
+        b_gal = QPushButton(self.translator.t("gallery", "Gallery")); b_gal.setIcon(std_icon(QStyle.SP_DirHomeIcon)); b_gal.clicked.connect(self.open_gallery)
+        b_pdf = QPushButton(self.translator.t("export_pdf", "Export PDF")); b_pdf.setIcon(std_icon(QStyle.SP_DialogSaveButton)); b_pdf.clicked.connect(self.export_selected_pdf)
         for b in [b_edit, b_del, b_dup, b_gal, b_pdf]: row.addWidget(b)
         gb_l.addLayout(row)
 
@@ -914,16 +1424,30 @@ class MainWindow(QMainWindow):
         return page
 
     def _placeholder_pixmap(self, w=280, h=240):
-        pm = QPixmap(w, h); pm.fill(QColor(240, 240, 240) if not getattr(self, "is_dark", True) else QColor(60, 60, 60))
-        p = QPainter(pm); p.setPen(QColor(120, 120, 120) if not self.is_dark else QColor(200, 200, 200))
-        f = QFont(); f.setPointSize(10); f.setBold(True); p.setFont(f)
-        p.drawText(pm.rect(), Qt.AlignCenter, "No Image" if self.lang == "en" else "لا توجد صورة"); p.end()
-        return pm
+        return placeholder_pixmap(w, h, getattr(self, "is_dark", True), self.lang)
+
+    @contextmanager
+    def _frozen_view(self):
+        """Suspend painting and selection signals on the dashboard table during a bulk refresh."""
+        self.table.setUpdatesEnabled(False); blocker = QSignalBlocker(self.table.selectionModel())
+        try:
+            yield
+        finally:
+            blocker.unblock(); self.table.setUpdatesEnabled(True); self.table.viewport().update()
+            self._forget_selected_row(); self._on_table_selection()  # one selection refresh after the reset
+
+    def _reload_table(self):
+        with self._frozen_view(): self.model.load_data()
+        self._update_status()
+
+    def _forget_selected_row(self, *_):
+        self._sel_src_row = -1
 
     def _selected_source_row(self):
-        sel = self.table.selectionModel().selectedRows()
-        if not sel: return None
-        idx_src = self.proxy.mapToSource(sel[0]); return idx_src.row()
+        if self._sel_src_row == -1:  # -1 = not mapped yet, None = nothing selected
+            sel = self.table.selectionModel().selectedRows()
+            self._sel_src_row = self.proxy.mapToSource(sel[0]).row() if sel else None
+        return self._sel_src_row
 
     def _on_table_selection(self):
         row_src = self._selected_source_row()
@@ -939,82 +1463,158 @@ class MainWindow(QMainWindow):
         self.ch_price.setText(f"{self.translator.t('price')}: {format_price(price, self.translator.lang)}")
         self.ch_drive.setText(f"{self.translator.t('drive_trains')}: {drive}")
         self.ch_engine.setText(f"{self.translator.t('engine_power')}: {engine} cc")
-        if img_path and os.path.exists(img_path):
-            pm = QPixmap(img_path); self.lbl_preview_img.setPixmap(pm.scaled(280, 240, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        else:
-            self.lbl_preview_img.setPixmap(self._placeholder_pixmap())
+        # the small sidecar written at ingest is preferred over decoding the full-size original
+        pm = load_thumbnail(thumb_path(img_path), 280, 240) if img_path else QPixmap()
+        if pm.isNull() and img_path: pm = load_thumbnail(img_path, 280, 240)
+        self.lbl_preview_img.setPixmap(pm if not pm.isNull() else self._placeholder_pixmap())
 
-    def _handle_drop_image(self, path):
+    @staticmethod
+    def _store_image(src_path, make, model, year):
+        """Copy an image into car_images/ (shutil.copyfile, no Python-side buffer)
+        and write its preview sidecar under car_images/.thumb/.
+
+        Returns the new path, or "" when the source file does not exist.
+        """
+        os.makedirs("car_images", exist_ok=True)
+        ext = os.path.splitext(src_path)[1] or ".png"
+        dst = os.path.join("car_images", f"{make}_{model}_{year}_{time.time_ns()}{ext}")
+        try:
+            shutil.copyfile(src_path, dst)
+        except FileNotFoundError:
+            return ""
+        write_thumbnail(dst)
+        return dst
+
+    @staticmethod
+    def _store_image_bytes(data, ext, make, model, year):
+        """Write downloaded image bytes into car_images/ as-is (no re-encode) plus the preview sidecar; returns the new path."""
+        os.makedirs("car_images", exist_ok=True)
+        dst = os.path.join("car_images", f"{make}_{model}_{year}_{time.time_ns()}{ext}")
+        with open(dst, "wb") as f: f.write(data)
+        write_thumbnail(dst)
+        return dst
+
+    def _drop_target(self):
+        """(car_id, make, model, year, old image path) of the selected car, or None after telling the user to pick one."""
         row_src = self._selected_source_row()
         if row_src is None:
-            QMessageBox.information(self, self.translator.t("warning"), self.translator.t("select_car_edit")); return
-        car = self.model.get_row(row_src); make, model, year = car[1], car[2], car[3]
-        old = car[12] or ""
+            QMessageBox.information(self, self.translator.t("warning"), self.translator.t("select_car_edit")); return None
+        car = self.model.get_row(row_src)
+        return car[0], car[1], car[2], car[3], car[12] or ""
+
+    def _handle_drop_url(self, url):
+        target = self._drop_target()
+        if target is None: return
+        car_id, make, model, year, old = target
+        def ingest():  # worker thread: download, then write the bytes straight to their final name
+            data = ImageDropLabel._download(url); ext = ImageDropLabel._web_image_ext(url, data)
+            if not ext: raise ValueError(f"not an image: {url}")
+            return self._store_image_bytes(data, ext, make, model, year)
+        self._run_task(ingest, lambda new_path, err: self._on_image_ingested(car_id, old, new_path, err))
+
+    def _handle_drop_image(self, path):
+        target = self._drop_target()
+        if target is None: return
+        car_id, make, model, year, old = target
+        def ingest():  # worker thread: file copy + thumbnail only; the shared connection stays on the GUI thread
+            new_path = self._store_image(path, make, model, year)
+            if not new_path: raise FileNotFoundError(path)
+            return new_path
+        self._run_task(ingest, lambda new_path, err: self._on_image_ingested(car_id, old, new_path, err))
+
+    def _on_image_ingested(self, car_id, old, new_path, err):
+        if err:
+            QMessageBox.critical(self, self.translator.t("error"), f"{self.translator.t('image_save_fail')}: {err}"); return
         try:
-            os.makedirs("car_images", exist_ok=True)
-            ext = os.path.splitext(path)[1] if os.path.splitext(path)[1] else ".png"
-            new_path = os.path.join("car_images", f"{make}_{model}_{year}_{int(pd.Timestamp.now().timestamp())}{ext}")
-            with open(path, "rb") as s, open(new_path, "wb") as d: d.write(s.read())
-            if old and os.path.exists(old):
-                try: os.remove(old)
-                except Exception: pass
-            self.db.update_car(car[0], {"image_path": new_path})
-            self.model.load_data(); self._on_table_selection()
-            Toast(self, self.translator.t("image_updated") if "image_updated" in self.translator.translations else "Image updated.", 1600)
+            self.db.update_car(car_id, {"image_path": new_path})
         except Exception as ex:
-            QMessageBox.critical(self, self.translator.t("error"), f"{self.translator.t('image_save_fail')}: {ex}")
+            remove_stored_image(new_path)
+            QMessageBox.critical(self, self.translator.t("error"), f"{self.translator.t('image_save_fail')}: {ex}"); return
+        remove_stored_image(old)  # only once the row points at the new file
+        self.model.update_row(car_id); self._on_table_selection()
+        Toast(self, self.translator.t("image_updated", "Image updated."), 1600)
+
+    def _run_task(self, fn, on_done, on_progress=None):
+        task = FuncTask(fn, progress=on_progress is not None); self._tasks[task] = on_done
+        if on_progress is not None: task.signals.progress.connect(on_progress)
+        task.signals.done.connect(self._on_task_done); QThreadPool.globalInstance().start(task)
+
+    def _run_with_progress(self, label, fn, on_done):
+        """Run fn(report) on the pool behind a window-modal progress dialog fed by report(percent)."""
+        dlg = QProgressDialog(label, None, 0, 100, self); dlg.setWindowModality(Qt.WindowModal); dlg.setMinimumDuration(300); dlg.setValue(0)
+        self._run_task(fn, lambda result, err: (dlg.close(), on_done(result, err)), on_progress=dlg.setValue)
+
+    def _on_task_done(self, task, result, err):
+        on_done = self._tasks.pop(task, None)
+        if on_done: on_done(result, err)
 
     def _open_header_menu(self, pos):
-        menu = QMenu(self)
-        hidden = set(map(str, self.settings.value("hiddenColumns", [], list)))
-        for i, key in enumerate(HEADER_KEYS):
-            if i == 0: continue
-            act = QAction(self.translator.t(key) if key != "ID" else "ID", self, checkable=True)
-            act.setChecked(str(i) not in hidden)
-            act.triggered.connect(lambda ch, col=i: self._toggle_column(col, ch))
-            menu.addAction(act)
-        menu.exec(QCursor.pos())
+        if self._header_menu is None:
+            self._header_menu = QMenu(self); self._header_actions = {}
+            for i, key in enumerate(HEADER_KEYS):
+                if i == 0: continue
+                act = QAction(self.translator.t(key) if key != "ID" else "ID", self._header_menu, checkable=True)
+                act.triggered.connect(lambda ch, col=i: self._toggle_column(col, ch))
+                self._header_menu.addAction(act); self._header_actions[i] = act
+        for i, act in self._header_actions.items(): act.setChecked(i not in self._hidden_cols)
+        self._header_menu.exec(QCursor.pos())
 
     def _open_columns_menu(self): self._open_header_menu(QPoint(0,0))
 
     def _toggle_column(self, col, show):
         self.table.setColumnHidden(col, not show)
-        hidden = set(map(str, self.settings.value("hiddenColumns", [], list)))
-        if not show: hidden.add(str(col))
-        else: hidden.discard(str(col))
-        self.settings.setValue("hiddenColumns", list(hidden))
+        if not show: self._hidden_cols.add(col)
+        else: self._hidden_cols.discard(col)
+        self._set_setting("hiddenColumns", [str(c) for c in sorted(self._hidden_cols)])
+
+    def _set_setting(self, key, value):
+        self._settings_dirty[key] = value; self._settings_timer.start()
+
+    def _flush_settings(self):
+        self._settings_timer.stop()
+        changed = {k: v for k, v in self._settings_dirty.items() if k not in self._settings_saved or self._settings_saved[k] != v}
+        self._settings_dirty.clear()
+        if not changed: return
+        for k, v in changed.items(): self.settings.setValue(k, v)
+        self._settings_saved.update(changed); self.settings.sync()
+
+    def _build_table_menu(self):
+        tr = self.translator; t = tr.t
+        menu = self._table_menu = QMenu(self); self._table_sel_actions = []
+        def add(key, text, icon=None, needs_sel=True):
+            act = menu.addAction(text); act.setData(key)
+            if icon is not None: act.setIcon(std_icon(icon))
+            if needs_sel: self._table_sel_actions.append(act)
+        add("add", tr.t("add_car"), QStyle.SP_FileDialogNewFolder, needs_sel=False)
+        self._table_sel_actions.append(menu.addSeparator())
+        add("edit", tr.t("edit"), QStyle.SP_FileDialogDetailedView)
+        add("dup", t("duplicate", "Duplicate"), QStyle.SP_FileDialogNewFolder)
+        add("del", tr.t("delete"), QStyle.SP_TrashIcon)
+        self._table_sel_actions.append(menu.addSeparator())
+        add("copy_cell", t("copy_cell", "Copy Cell")); add("copy_row", t("copy_row", "Copy Row")); add("copy_col", t("copy_column", "Copy Column"))
+        self._table_sel_actions.append(menu.addSeparator())
+        add("export_csv", t("export_row_csv", "Export Row (CSV)"), QStyle.SP_DialogSaveButton)
+        add("export_xlsx", t("export_row_excel", "Export Row (Excel)"), QStyle.SP_DialogSaveButton)
+        add("export_pdf", t("export_pdf", "Export PDF"), QStyle.SP_DialogSaveButton)
 
     def _open_table_menu(self, pos):
         idx = self.table.indexAt(pos)
         if idx.isValid(): self.table.selectRow(idx.row())
-        menu = QMenu(self)
-        act_add = QAction(self.translator.t("add_car"), self); act_add.setIcon(std_icon(QStyle.SP_FileDialogNewFolder)); menu.addAction(act_add)
-        sel = self.table.selectionModel().selectedRows()
-        if sel:
-            menu.addSeparator()
-            act_edit = QAction(self.translator.t("edit"), self); act_edit.setIcon(std_icon(QStyle.SP_FileDialogDetailedView)); menu.addAction(act_edit)
-            act_dup = QAction(self.translator.t("duplicate") if "duplicate" in self.translator.translations else "Duplicate", self); act_dup.setIcon(std_icon(QStyle.SP_FileDialogNewFolder)); menu.addAction(act_dup)
-            act_del = QAction(self.translator.t("delete"), self); act_del.setIcon(std_icon(QStyle.SP_TrashIcon)); menu.addAction(act_del)
-            menu.addSeparator()
-            act_copy_cell = QAction(self.translator.t("copy_cell") if "copy_cell" in self.translator.translations else "Copy Cell", self)
-            act_copy_row = QAction(self.translator.t("copy_row") if "copy_row" in self.translator.translations else "Copy Row", self)
-            act_copy_col = QAction(self.translator.t("copy_column") if "copy_column" in self.translator.translations else "Copy Column", self)
-            menu.addAction(act_copy_cell); menu.addAction(act_copy_row); menu.addAction(act_copy_col)
-            menu.addSeparator()
-            act_export_csv = QAction(self.translator.t("export_row_csv") if "export_row_csv" in self.translator.translations else "Export Row (CSV)", self); act_export_csv.setIcon(std_icon(QStyle.SP_DialogSaveButton)); menu.addAction(act_export_csv)
-            act_export_xlsx = QAction(self.translator.t("export_row_excel") if "export_row_excel" in self.translator.translations else "Export Row (Excel)", self); act_export_xlsx.setIcon(std_icon(QStyle.SP_DialogSaveButton)); menu.addAction(act_export_xlsx)
-            act_export_pdf = QAction(self.translator.t("export_pdf") if "export_pdf" in self.translator.translations else "Export PDF", self); act_export_pdf.setIcon(std_icon(QStyle.SP_DialogSaveButton)); menu.addAction(act_export_pdf)
-        chosen = menu.exec(self.table.viewport().mapToGlobal(pos))
-        if chosen == act_add: self.add_car_dialog()
-        elif sel and chosen == act_edit: self.edit_selected_car()
-        elif sel and chosen == act_dup: self.duplicate_selected_car()
-        elif sel and chosen == act_del: self.delete_selected_car()
-        elif sel and chosen == act_copy_cell: self._copy_selected_cell(idx if idx.isValid() else None)
-        elif sel and chosen == act_copy_row: self._copy_selected_row()
-        elif sel and chosen == act_copy_col: self._copy_column(idx.column() if idx.isValid() else 0)
-        elif sel and chosen == act_export_csv: self._export_selected_row(csv=True)
-        elif sel and chosen == act_export_xlsx: self._export_selected_row(csv=False)
-        elif sel and chosen == act_export_pdf: self.export_selected_pdf()
+        if self._table_menu is None: self._build_table_menu()
+        sel = bool(self.table.selectionModel().selectedRows())
+        for act in self._table_sel_actions: act.setVisible(sel)
+        chosen = self._table_menu.exec(self.table.viewport().mapToGlobal(pos))
+        key = chosen.data() if chosen is not None else None
+        if key == "add": self.add_car_dialog()
+        elif key == "edit": self.edit_selected_car()
+        elif key == "dup": self.duplicate_selected_car()
+        elif key == "del": self.delete_selected_car()
+        elif key == "copy_cell": self._copy_selected_cell(idx if idx.isValid() else None)
+        elif key == "copy_row": self._copy_selected_row()
+        elif key == "copy_col": self._copy_column(idx.column() if idx.isValid() else 0)
+        elif key == "export_csv": self._export_selected_row(as_csv=True)
+        elif key == "export_xlsx": self._export_selected_row(as_csv=False)
+        elif key == "export_pdf": self.export_selected_pdf()
 
     def _copy_selected_cell(self, idx):
         if not idx or not idx.isValid(): return
@@ -1023,35 +1623,31 @@ class MainWindow(QMainWindow):
     def _copy_selected_row(self):
         row_src = self._selected_source_row()
         if row_src is None: return
-        rec = self.model.get_row(row_src); vals = []
-        for c in range(len(DISPLAY_COLS)):
-            v = rec[DISPLAY_COLS[c]]
-            vals.append(format_price(v, self.translator.lang) if c == 4 and isinstance(v,(int,float)) else str(v))
+        vals = self.model.row_text(row_src)
         QApplication.clipboard().setText("\t".join(vals)); Toast(self, self.translator.t("copy")+" ✓", 1000)
 
     def _copy_column(self, col_proxy):
-        out = []
-        for r in range(self.proxy.rowCount()):
-            val = self.proxy.data(self.proxy.index(r, col_proxy), Qt.DisplayRole); out.append("" if val is None else str(val))
+        out = self.model.column_text(col_proxy, self.proxy.visible_source_rows())  # proxy keeps source columns
         QApplication.clipboard().setText("\n".join(out)); Toast(self, self.translator.t("copy")+" ✓", 1000)
 
-    def _export_selected_row(self, csv=True):
+    def _export_selected_row(self, as_csv=True):
         row_src = self._selected_source_row()
         if row_src is None: return
         car = self.model.get_row(row_src); headers = HEADER_KEYS + ["Image Path"]; data = list(car[:12]) + [car[12]]
-        df = pd.DataFrame([data], columns=headers)
-        default = f"car_{car[0]}.{'csv' if csv else 'xlsx'}"
-        cap = self.translator.t("export_row") if "export_row" in self.translator.translations else "Export Row"
-        if csv: fp, _ = QFileDialog.getSaveFileName(self, cap, default, "CSV (*.csv)")
+        default = f"car_{car[0]}.{'csv' if as_csv else 'xlsx'}"
+        cap = self.translator.t("export_row", "Export Row")
+        if as_csv: fp, _ = QFileDialog.getSaveFileName(self, cap, default, "CSV (*.csv)")
         else: fp, _ = QFileDialog.getSaveFileName(self, cap, default, "Excel (*.xlsx)")
         if not fp: return
         try:
-            if csv:
+            # one row: write it directly rather than building a DataFrame
+            if as_csv:
                 if not fp.lower().endswith(".csv"): fp += ".csv"
-                df.to_csv(fp, index=False)
+                with open(fp, "w", newline="", encoding="utf-8") as f:
+                    w = csv.writer(f); w.writerow(headers); w.writerow(data)
             else:
                 if not fp.lower().endswith(".xlsx"): fp += ".xlsx"
-                df.to_excel(fp, index=False)
+                write_xlsx(fp, headers, [data])
             QMessageBox.information(self, self.translator.t("success"), self.translator.t("export_success"))
         except Exception as e:
             QMessageBox.critical(self, self.translator.t("error"), f"{self.translator.t('export_fail')}: {e}")
@@ -1061,37 +1657,29 @@ class MainWindow(QMainWindow):
         if row_src is None:
             QMessageBox.warning(self, self.translator.t("warning"), self.translator.t("select_car_edit")); return
         car = self.model.get_row(row_src)
-        fp, _ = QFileDialog.getSaveFileName(self, self.translator.t("export_pdf") if "export_pdf" in self.translator.translations else "Export PDF",
+        fp, _ = QFileDialog.getSaveFileName(self, self.translator.t("export_pdf", "Export PDF"),
                                             f"car_{car[0]}.pdf", "PDF (*.pdf)")
         if not fp: return
-        img_html = ""
-        if car[12] and os.path.exists(car[12]):
-            data = bytes_from_image_path(car[12], 400)
-            if data:
-                img_html = f'<img src="data:image/png;base64,{base64.b64encode(data).decode()}" style="max-width:400px;"/><br/>'
-        html = f"""
-        <html><body>
-        <h2>{car[1]} {car[2]} ({car[3]})</h2>
-        {img_html}
-        <p><b>{self.translator.t('price')}:</b> {format_price(car[4], self.translator.lang)}</p>
-        <p><b>{self.translator.t('color')}:</b> {car[5]} &nbsp; <b>{self.translator.t('type')}:</b> {car[6]}</p>
-        <p><b>{self.translator.t('condition')}:</b> {car[7]} &nbsp; <b>{self.translator.t('drive_trains')}:</b> {car[8]}</p>
-        <p><b>{self.translator.t('engine_power')}:</b> {car[9]} &nbsp; <b>{self.translator.t('liter_capacity')}:</b> {car[10]}</p>
-        <p><b>{self.translator.t('salesperson')}:</b> {car[11]}</p>
-        </body></html>
-        """
+        # hand the decoded image to the document as a resource: no encode -> base64 -> decode round-trip
+        doc = QTextDocument(); img_html = ""
+        if car[12]:
+            reader = QImageReader(car[12]); reader.setAutoTransform(True); size = reader.size()
+            if size.isValid() and size.width() > 400: reader.setScaledSize(size.scaled(400, size.height(), Qt.KeepAspectRatio))
+            img = reader.read()
+            if not img.isNull():
+                doc.addResource(QTextDocument.ImageResource, QUrl("car_img"), img); img_html = '<img src="car_img"/><br/>'
+        ctx = dict(zip(HEADER_KEYS[1:], car[1:12]), price=format_price(car[4], self.translator.lang), img_html=img_html)
+        html = PDF_TEMPLATE.format_map({**self._pdf_labels, **ctx})
         try:
             printer = QPrinter(QPrinter.HighResolution); printer.setOutputFormat(QPrinter.PdfFormat)
             if not fp.lower().endswith(".pdf"): fp += ".pdf"
-            printer.setOutputFileName(fp); doc = QTextDocument(); doc.setHtml(html); doc.print_(printer)
+            printer.setOutputFileName(fp); doc.setHtml(html); doc.print_(printer)
             Toast(self, "PDF ✓", 1200)
         except Exception as e:
             QMessageBox.critical(self, self.translator.t("error"), str(e))
 
     def _select_by_id(self, car_id: int):
-        target = -1
-        for i, rec in enumerate(getattr(self.model, "_data", [])):
-            if rec and rec[0] == car_id: target = i; break
+        target = self.model.row_of_id(car_id)
         if target == -1: return
         src_index = self.model.index(target, 0); proxy_index = self.proxy.mapFromSource(src_index)
         if proxy_index.isValid():
@@ -1109,13 +1697,10 @@ class MainWindow(QMainWindow):
             except ValueError as e:
                 QMessageBox.critical(self, self.translator.t("error"), str(e)); return
             stored = car[12] or ""
-            if image_path and image_path != stored and os.path.exists(image_path):
+            if image_path and image_path != stored:
                 try:
-                    os.makedirs("car_images", exist_ok=True)
-                    ext = os.path.splitext(image_path)[1]
-                    stored = os.path.join("car_images", f"{make}_{model}_{year}_{int(pd.Timestamp.now().timestamp())}{ext}")
-                    with open(image_path, "rb") as s, open(stored, "wb") as d: d.write(s.read())
-                    if car[12] and os.path.exists(car[12]): os.remove(car[12])
+                    new_path = self._store_image(image_path, make, model, year)
+                    if new_path: remove_stored_image(car[12]); stored = new_path
                 except Exception as ex:
                     QMessageBox.warning(self, self.translator.t("warning"), f"{self.translator.t('image_save_fail')}: {ex}")
             self.db.update_car(car[0], {
@@ -1124,7 +1709,7 @@ class MainWindow(QMainWindow):
                 "engine_power": engine, "liter_capacity": liter, "salesperson": sales, "image_path": stored
             })
             QMessageBox.information(self, self.translator.t("success"), self.translator.t("car_updated"))
-            self.model.load_data(); self._on_table_selection(); self._update_status()
+            self.model.update_row(car[0]); self._on_table_selection(); self._update_status()
 
     def duplicate_selected_car(self):
         row_src = self._selected_source_row()
@@ -1138,18 +1723,15 @@ class MainWindow(QMainWindow):
             except ValueError as e:
                 QMessageBox.critical(self, self.translator.t("error"), str(e)); return
             stored = ""
-            if image_path and os.path.exists(image_path):
+            if image_path:
                 try:
-                    os.makedirs("car_images", exist_ok=True)
-                    ext = os.path.splitext(image_path)[1]
-                    stored = os.path.join("car_images", f"{make}_{model}_{year}_{int(pd.Timestamp.now().timestamp())}{ext}")
-                    with open(image_path, "rb") as s, open(stored, "wb") as d: d.write(s.read())
+                    stored = self._store_image(image_path, make, model, year)
                 except Exception as ex:
                     QMessageBox.warning(self, self.translator.t("warning"), f"{self.translator.t('image_save_fail')}: {ex}")
             new_id = self.db.insert_car((make, model, year, price, color, car_type, condition, drive, engine, liter, sales, stored))
             Toast(self, self.translator.t("car_added"), 1200)
-            self.ed_quick_filter.clear(); self.proxy.setQuery("")
-            self.model.load_data(); self._select_by_id(new_id); self._update_status()
+            self.ed_quick_filter.clear(); self.proxy.setQuery("", 0)
+            self.model.insert_row(new_id); self._select_by_id(new_id); self._update_status()
 
     def add_car_dialog(self):
         dlg = CarFormDialog(self.translator, self, car=None)
@@ -1159,17 +1741,14 @@ class MainWindow(QMainWindow):
             except ValueError as e:
                 QMessageBox.critical(self, self.translator.t("error"), str(e)); return
             stored = ""
-            if image_path and os.path.exists(image_path):
+            if image_path:
                 try:
-                    os.makedirs("car_images", exist_ok=True)
-                    ext = os.path.splitext(image_path)[1]
-                    stored = os.path.join("car_images", f"{make}_{model}_{year}_{int(pd.Timestamp.now().timestamp())}{ext}")
-                    with open(image_path, "rb") as s, open(stored, "wb") as d: d.write(s.read())
+                    stored = self._store_image(image_path, make, model, year)
                 except Exception as ex:
                     QMessageBox.warning(self, self.translator.t("warning"), f"{self.translator.t('image_save_fail')}: {ex}")
             new_id = self.db.insert_car((make, model, year, price, color, car_type, condition, drive, engine, liter, sales, stored))
             self.stack.setCurrentWidget(self.page_dashboard); self._set_active_nav(self.btn_dashboard)
-            self.ed_quick_filter.clear(); self.proxy.setQuery(""); self.model.load_data()
+            self.ed_quick_filter.clear(); self.proxy.setQuery("", 0); self.model.insert_row(new_id)
             self._select_by_id(new_id); self._update_status(); Toast(self, self.translator.t("car_added"), 1200)
 
     def delete_selected_car(self):
@@ -1183,13 +1762,15 @@ class MainWindow(QMainWindow):
         for idx in sels:
             car = self.model.get_row(self.proxy.mapToSource(idx).row())
             if car: to_delete.append(car)
-        for car in to_delete:
-            try:
-                if car[12] and os.path.exists(car[12]): os.remove(car[12])
-            except Exception: pass
-            self.db.delete_car(car[0])
+        ids = [car[0] for car in to_delete]
+        try:
+            self.db.delete_cars(ids)
+        except Exception as ex:
+            QMessageBox.critical(self, self.translator.t("error"), str(ex)); return
+        self.model.remove_rows(ids)
+        for car in to_delete: remove_stored_image(car[12])  # only once the rows are gone
         QMessageBox.information(self, self.translator.t("success"), self.translator.t("car_deleted"))
-        self.model.load_data(); self._on_table_selection(); self._update_status()
+        self._on_table_selection(); self._update_status()
 
     def open_gallery(self):
         row_src = self._selected_source_row()
@@ -1198,7 +1779,7 @@ class MainWindow(QMainWindow):
         car = self.model.get_row(row_src)
         dlg = GalleryDialog(self.translator, self.db, car_id=car[0], parent=self)
         if dlg.exec() == QDialog.Accepted:
-            self.model.load_data(); self._on_table_selection()
+            self.model.update_row(car[0]); self._on_table_selection()
 
     def _focus_quick_filter(self):
         self.stack.setCurrentWidget(self.page_dashboard); self.ed_quick_filter.setFocus(); self.ed_quick_filter.selectAll()
@@ -1251,93 +1832,157 @@ class MainWindow(QMainWindow):
         v.addWidget(self.canvas_holder, 1); return page
 
     def _apply_matplotlib_style(self):
-        plt.style.use("dark_background" if getattr(self, "is_dark", True) else "default")
+        import matplotlib
+        from matplotlib import style as mpl_style
+        mpl_style.use("dark_background" if getattr(self, "is_dark", True) else "default")
         if self.lang == "ar":
             matplotlib.rcParams["font.sans-serif"] = ["Cairo", "Noto Naskh Arabic", "Amiri", "Arial", "Segoe UI"]
             matplotlib.rcParams["axes.unicode_minus"] = False
 
+    def _mark_analytics_dirty(self, *_):
+        self._analytics_dirty = True
+
+    def _show_analytics(self):
+        if self._analytics_dirty: self._apply_matplotlib_style(); self._refresh_analytics()
+        self.stack.setCurrentWidget(self.page_analytics); self._set_active_nav(self.btn_analytics)
+
     def _refresh_analytics(self):
-        cars = self.db.fetch_all_cars(); total = len(cars)
-        avg_price = (sum(c[4] for c in cars) / total) if total else 0.0
+        self._analytics_dirty = False
+        total, avg_price = self.db.analytics_summary()  # aggregates come back from SQL, no row transfer
+        by_make = self.db.counts_by_make() if total else []
+        fp = (total, avg_price, tuple(by_make), self.is_dark, self.lang)
+        if fp == self._analytics_fp and self.canvas is not None: return  # same data, theme and language: keep the drawing
+        prev, self._analytics_fp = self._analytics_fp, fp
+        import matplotlib
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
         self.lbl_stats.setText(f"{self.translator.t('total_cars')}: {total}   |   {self.translator.t('average_price')}: {format_price(avg_price, self.translator.lang)}")
-        lay = self.canvas_holder.layout()
-        for i in reversed(range(lay.count())):
-            w = lay.itemAt(i).widget()
-            if w: w.setParent(None)
-        if not cars: return
-        makes = [c[1] for c in cars]; counts = Counter(makes)
-        fig, ax = plt.subplots(figsize=(7,4))
-        ax.bar(list(counts.keys()), list(counts.values()), color="#2563eb" if self.is_dark else "#1d4ed8")
+        if self.canvas is None:  # one Figure/canvas for the page's lifetime, redrawn in place
+            self.canvas = FigureCanvas(Figure(figsize=(7,4))); self.canvas_holder.layout().addWidget(self.canvas)
+        self.canvas.setVisible(bool(total))
+        makes, counts = zip(*by_make) if by_make else ((), ())
+        if self._bars is not None and prev[3:] == fp[3:] and tuple(m for m, _ in prev[2]) == makes:
+            # same makes, theme and language: only the bar heights moved
+            for bar, n in zip(self._bars.patches, counts): bar.set_height(n)
+            ax = self._bars.patches[0].axes; ax.relim(); ax.autoscale_view(); self.canvas.draw_idle(); return
+        fig = self.canvas.figure; fig.clear(); fig.set_facecolor(matplotlib.rcParams["figure.facecolor"]); self._bars = None
+        if not total: return
+        ax = fig.add_subplot()
+        self._bars = ax.bar([str(m) for m in makes], counts, color="#2563eb" if self.is_dark else "#1d4ed8")
         ax.set_title(self.translator.t("cars_by_make")); ax.set_xlabel(self.translator.t("make")); ax.set_ylabel(self.translator.t("count"))
-        plt.xticks(rotation=45, ha="right"); plt.tight_layout()
-        self.canvas = FigureCanvas(fig); lay.addWidget(self.canvas)
+        ax.tick_params(axis="x", labelrotation=45)
+        for lbl in ax.get_xticklabels(): lbl.set_ha("right")
+        fig.tight_layout(); self.canvas.draw_idle()
 
     # Export / Import / Backup (same as above code)
     def export_to_excel(self):
-        cars = self.db.fetch_all_cars()
-        if not cars: QMessageBox.warning(self, self.translator.t("warning"), self.translator.t("no_data_export")); return
-        fp, _ = QFileDialog.getSaveFileName(self, self.translator.t("export"), filter="Excel files (*.xlsx)")
+        if not self.db.count_cars(): QMessageBox.warning(self, self.translator.t("warning"), self.translator.t("no_data_export")); return
+        fp, chosen = QFileDialog.getSaveFileName(self, self.translator.t("export"), filter="Excel files (*.xlsx);;CSV files (*.csv)")
         if not fp: return
-        cols = HEADER_KEYS + ["Image Path"]; df = pd.DataFrame(cars, columns=cols)
+        headers = HEADER_KEYS + ["Image Path"]
         try:
-            if not fp.lower().endswith(".xlsx"): fp += ".xlsx"
-            df.to_excel(fp, index=False); QMessageBox.information(self, self.translator.t("success"), self.translator.t("export_success"))
+            if fp.lower().endswith(".csv") or (chosen.startswith("CSV") and not fp.lower().endswith(".xlsx")):
+                # plain text straight off the cursor: no workbook/styling layer, so large inventories stay I/O-bound
+                if not fp.lower().endswith(".csv"): fp += ".csv"
+                with open(fp, "w", newline="", encoding="utf-8") as f:
+                    w = csv.writer(f); w.writerow(headers); w.writerows(self.db.iter_cars())
+            else:
+                if not fp.lower().endswith(".xlsx"): fp += ".xlsx"
+                write_xlsx(fp, headers, self.db.iter_cars())
+            QMessageBox.information(self, self.translator.t("success"), self.translator.t("export_success"))
         except Exception as e:
             QMessageBox.critical(self, self.translator.t("error"), f"{self.translator.t('export_fail')}: {e}")
 
     def import_data(self):
-        fp, _ = QFileDialog.getOpenFileName(self, self.translator.t("import_data") if "import_data" in self.translator.translations else "Import Data",
+        fp, _ = QFileDialog.getOpenFileName(self, self.translator.t("import_data", "Import Data"),
                                             filter="Data files (*.csv *.xlsx)")
         if not fp: return
         try:
-            df = pd.read_csv(fp) if fp.lower().endswith(".csv") else pd.read_excel(fp)
+            frames = iter_import_frames(fp); first = next(frames)
         except Exception as e:
             QMessageBox.critical(self, self.translator.t("error"), str(e)); return
-        required = ["make","model","year","price","color","type","condition","drive_trains","engine_power","liter_capacity","salesperson"]
-        missing = [c for c in required if c not in df.columns]
+        missing = [c for c in IMPORT_COLS if c not in first.columns]
         if missing:
-            QMessageBox.warning(self, self.translator.t("warning"), f"Missing columns: {', '.join(missing)}"); return
-        ok=failed=0
-        for _, r in df.iterrows():
-            try:
-                make=str(r["make"]).strip(); model=str(r["model"]).strip(); year=int(r["year"])
-                price=float(r["price"]); color=str(r["color"]).strip(); car_type=str(r["type"]).strip()
-                condition=str(r["condition"]).strip(); drive=str(r["drive_trains"]).strip()
-                engine=int(r["engine_power"]); liter=int(r["liter_capacity"]); sales=str(r["salesperson"]).strip()
-                if not (make and model and color and sales): raise ValueError("required")
-                if car_type not in ENUM_TYPES or condition not in ENUM_CONDITIONS or drive not in ENUM_DRIVES: raise ValueError("enum")
-                if not (1886<=year<=2050) or price<=0 or engine<=0 or liter<=0: raise ValueError("numeric")
-                self.db.insert_car((make, model, year, price, color, car_type, condition, drive, engine, liter, sales, ""))
-                ok+=1
-            except Exception: failed+=1
-        self.model.load_data(); self._update_status()
+            frames.close(); QMessageBox.warning(self, self.translator.t("warning"), f"Missing columns: {', '.join(missing)}"); return
+        progress = QProgressDialog(self.translator.t("import_data", "Import Data"), None, 0, 0, self)
+        progress.setWindowModality(Qt.WindowModal); progress.setMinimumDuration(500)
+        ok = failed = 0; err = None
+        try:
+            for df in chain([first], frames):  # each chunk: validated column-wise, inserted in one transaction
+                rows, bad = prepare_import(df); ok += self.db.insert_cars_bulk(rows); failed += bad
+                progress.setLabelText(f"Imported: {ok}, Failed: {failed}"); progress.setValue(0); QApplication.processEvents()
+        except Exception as e:
+            err = e
+        finally:
+            progress.close()
+        self._reload_table()
+        if err is not None:
+            QMessageBox.critical(self, self.translator.t("error"), f"{err}\nImported: {ok}, Failed: {failed}"); return
         QMessageBox.information(self, self.translator.t("success"), f"Imported: {ok}, Failed: {failed}")
 
     def backup_data(self):
         fp, _ = QFileDialog.getSaveFileName(self, self.translator.t("backup"), "backup.zip", "Zip (*.zip)")
         if not fp: return
-        try:
-            if not fp.lower().endswith(".zip"): fp += ".zip"
-            with zipfile.ZipFile(fp, "w", zipfile.ZIP_DEFLATED) as z:
-                if os.path.exists(self.db.db_file): z.write(self.db.db_file, arcname=os.path.basename(self.db.db_file))
-                if os.path.exists("car_images"):
-                    for root, _, files in os.walk("car_images"):
-                        for f in files: z.write(os.path.join(root,f), arcname=os.path.relpath(os.path.join(root,f), os.getcwd()))
-            Toast(self, "Backup ✓", 1200)
-        except Exception as e:
-            QMessageBox.critical(self, self.translator.t("error"), str(e))
+        if not fp.lower().endswith(".zip"): fp += ".zip"
+        db_file = self.db.db_file
+
+        def work(report):  # worker thread: only files, no Qt widgets
+            # zip a backup-API snapshot, not the live file: a write landing mid-zip would tear the copy
+            fd, snap = tempfile.mkstemp(suffix=".db"); os.close(fd)
+            try:
+                src, dst = sqlite3.connect(db_file), sqlite3.connect(snap)
+                try: src.backup(dst)  # one step, one read transaction -> a consistent copy incl. the WAL
+                finally: dst.close(); src.close()
+                files = [(snap, os.path.getsize(snap))] + scan_files("car_images")  # sizes come with the listing, reused for progress
+                total = sum(size for _, size in files) or 1; written = 0
+                with zipfile.ZipFile(fp, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+                    for p, size in files:
+                        if p == snap: z.write(p, arcname=os.path.basename(db_file))
+                        else:
+                            method = zipfile.ZIP_STORED if os.path.splitext(p)[1].lower() in STORED_EXTS else zipfile.ZIP_DEFLATED
+                            z.write(p, arcname=os.path.relpath(p, os.getcwd()), compress_type=method)
+                        written += size; report(written * 100 // total)
+            finally:
+                os.remove(snap)
+
+        def finished(_, err):
+            if err: QMessageBox.critical(self, self.translator.t("error"), err)
+            else: Toast(self, "Backup ✓", 1200)
+        self._run_with_progress(self.translator.t("backup"), work, finished)
 
     def restore_data(self):
         fp, _ = QFileDialog.getOpenFileName(self, self.translator.t("restore"), filter="Zip (*.zip)")
         if not fp: return
-        if QMessageBox.question(self, self.translator.t("confirm"), self.translator.t("confirm_restore") if "confirm_restore" in self.translator.translations else "Restore will overwrite current data. Continue?") != QMessageBox.Yes:
+        if QMessageBox.question(self, self.translator.t("confirm"), self.translator.t("confirm_restore", "Restore will overwrite current data. Continue?")) != QMessageBox.Yes:
             return
-        try:
-            with zipfile.ZipFile(fp, "r") as z: z.extractall(os.getcwd())
-            self.db.close(); self.db = Database()  # reopen
-            self.model.db = self.db; self.model.load_data(); self._update_status(); Toast(self, "Restore ✓", 1200)
-        except Exception as e:
-            QMessageBox.critical(self, self.translator.t("error"), str(e))
+        dest = os.getcwd()
+        # extract into a scratch dir beside the data (same filesystem, so the swap is a rename); the live db stays open meanwhile
+        staging = tempfile.mkdtemp(prefix=".restore-", dir=dest)
+
+        def work(report):  # worker thread: extraction only; the swap and reopen happen on the GUI thread
+            with zipfile.ZipFile(fp, "r") as z:
+                infos = z.infolist(); total = sum(i.file_size for i in infos) or 1; extracted = 0
+                for i in infos:
+                    z.extract(i, staging); extracted += i.file_size; report(extracted * 100 // total)
+
+        def finished(_, err):
+            try:
+                if not err:
+                    self.db.close()  # folds the WAL in; the restored file replaces it below
+                    try:
+                        for root, _dirs, files in os.walk(staging):
+                            out = os.path.join(dest, os.path.relpath(root, staging)); os.makedirs(out, exist_ok=True)
+                            for name in files: os.replace(os.path.join(root, name), os.path.join(out, name))
+                    finally:
+                        self.db = Database()  # reopen, even if a rename failed part-way
+                        self.model.db = self.model_search.db = self.db; self._reload_table()
+            except Exception as e:
+                err = str(e)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            if err: QMessageBox.critical(self, self.translator.t("error"), err)
+            else: Toast(self, "Restore ✓", 1200)
+        self._run_with_progress(self.translator.t("restore"), work, finished)
 
     # Theme / QSS / Language / Status / State
     def _apply_app_font(self):
@@ -1347,7 +1992,7 @@ class MainWindow(QMainWindow):
     def _apply_shadows(self):
         def shadow(w, r=12, op=0.22):
             eff = QGraphicsDropShadowEffect(self); eff.setBlurRadius(r); eff.setOffset(0,2); eff.setColor(QColor(0,0,0,int(255*op))); w.setGraphicsEffect(eff)
-        for gb in self.page_dashboard.findChildren(QGroupBox): shadow(gb, 16, 0.20)
+        for gb, _ in self._retitled_groups: shadow(gb, 16, 0.20)
 
     def _apply_qss(self):
         if getattr(self, "is_dark", True):
@@ -1387,7 +2032,7 @@ class MainWindow(QMainWindow):
 
     def _apply_theme(self, dark=True):
         self.is_dark = dark
-        app = QApplication.instance(); app.setStyle("Fusion")
+        app = QApplication.instance(); app.setStyle("Fusion"); std_icon.cache_clear()  # icons belong to the style
         pal = QPalette()
         if dark:
             pal.setColor(QPalette.Window, QColor(32,33,36)); pal.setColor(QPalette.WindowText, Qt.white)
@@ -1404,88 +2049,96 @@ class MainWindow(QMainWindow):
         app.setPalette(pal); self._apply_qss()
 
     def toggle_theme(self):
-        self._apply_theme(not getattr(self, "is_dark", True)); self._apply_matplotlib_style()
-        if self.stack.currentWidget() == self.page_analytics: self._refresh_analytics()
+        self._apply_theme(not getattr(self, "is_dark", True)); self._analytics_dirty = True
+        for m in (self.model, self.model_search): m.set_highlight_query(m.highlight_query)  # re-pick highlight color
+        if self.stack.currentWidget() == self.page_analytics: self._show_analytics()
 
     def toggle_language(self):
         self.lang = "ar" if self.lang == "en" else "en"; self.translator = Translator(self.lang)
         QApplication.setLayoutDirection(Qt.RightToLeft if self.lang=="ar" else Qt.LeftToRight)
         self._apply_app_font(); self._update_texts(); self._set_tooltips()
-        self.model.update_translator(self.translator); self.model_search.update_translator(self.translator)
-        self.model.headerDataChanged.emit(Qt.Horizontal, 0, self.model.columnCount()-1)
-        self.model_search.headerDataChanged.emit(Qt.Horizontal, 0, self.model_search.columnCount()-1)
-        self._on_table_selection(); 
-        if self.stack.currentWidget()==self.page_analytics: self._refresh_analytics()
+        if self._header_menu is not None: self._header_menu.deleteLater(); self._header_menu = None
+        if self._table_menu is not None: self._table_menu.deleteLater(); self._table_menu = None
+        self.model.update_translator(self.translator); self.model_search.update_translator(self.translator)  # emit their own header/cell updates
+        self._on_table_selection(); self._analytics_dirty = True
+        if self.stack.currentWidget()==self.page_analytics: self._show_analytics()
         self._update_status()
 
     def _update_texts(self):
+        t = self.translator.t  # status-bar labels are resolved once per language, not on every status refresh
+        self._status_labels = (t("visible", "Visible"), t("total_cars"), t("average_price"), t("median_price", "Median"))
+        self._pdf_labels = {f"{k}_lbl": self.translator.t(k) for k in PDF_LABELS}  # per language, reused by every PDF export
         self.btn_dashboard.setText(self.translator.t("dashboard"))
         self.btn_add.setText(self.translator.t("add_car"))
         self.btn_search.setText(self.translator.t("search"))
         self.btn_analytics.setText(self.translator.t("analytics") if self.lang=="en" else "التحليلات")
-        self.btn_import.setText(self.translator.t("import_data") if "import_data" in self.translator.translations else "Import")
+        self.btn_import.setText(self.translator.t("import_data", "Import"))
         self.btn_export.setText(self.translator.t("export"))
-        self.btn_columns.setText(self.translator.t("columns") if "columns" in self.translator.translations else "Columns")
+        self.btn_columns.setText(self.translator.t("columns", "Columns"))
         self.btn_backup.setText(self.translator.t("backup")); self.btn_restore.setText(self.translator.t("restore"))
         self.btn_toggle_theme.setText(self.translator.t("toggle_theme")); self.btn_toggle_lang.setText(self.translator.t("toggle_language"))
         self.btn_exit.setText(self.translator.t("exit"))
         self.lb_dash_title.setText(self.translator.t("dashboard"))
         self.lb_search_title.setText(self.translator.t("search"))
         self.lb_analytics_title.setText(self.translator.t("analytics") if self.lang=="en" else "التحليلات")
-        for w in self.page_dashboard.findChildren(QGroupBox):
-            if w.title(): w.setTitle(self.translator.t("upload_image"))
+        for gb, key in self._retitled_groups: gb.setTitle(self.translator.t(key))
         self.ed_quick_filter.setPlaceholderText(self.translator.t("search")+"…")
-        self.btn_do_search.setText(self.translator.t("search_btn") if "search_btn" in self.translator.translations else self.translator.t("search"))
+        self.btn_do_search.setText(self.translator.t("search_btn", self.translator.t("search")))
 
     def _set_tooltips(self):
         self.btn_dashboard.setToolTip("Dashboard"); self.btn_add.setToolTip(f"{self.translator.t('add_car')} (Ctrl+N)")
         self.btn_search.setToolTip(self.translator.t("search")); self.btn_analytics.setToolTip(self.translator.t("analytics"))
-        self.btn_import.setToolTip(self.translator.t("import_data") if "import_data" in self.translator.translations else "Import data")
-        self.btn_export.setToolTip(self.translator.t("export")); self.btn_columns.setToolTip(self.translator.t("columns") if "columns" in self.translator.translations else "Columns")
+        self.btn_import.setToolTip(self.translator.t("import_data", "Import data"))
+        self.btn_export.setToolTip(self.translator.t("export")); self.btn_columns.setToolTip(self.translator.t("columns", "Columns"))
         self.btn_backup.setToolTip(self.translator.t("backup")); self.btn_restore.setToolTip(self.translator.t("restore"))
         self.btn_toggle_theme.setToolTip(self.translator.t("toggle_theme")); self.btn_toggle_lang.setToolTip(self.translator.t("toggle_language"))
         self.btn_exit.setToolTip(self.translator.t("exit"))
-        self.lbl_preview_img.setToolTip(self.translator.t("drop_image_hint") if "drop_image_hint" in self.translator.translations else "Drop image here")
+        self.lbl_preview_img.setToolTip(self.translator.t("drop_image_hint", "Drop image here"))
+
+    def _recount(self, *_):
+        self._visible_row_count = self.proxy.rowCount()
 
     def _update_status(self):
-        rows = self.proxy.rowCount(); total = self.model.rowCount(); prices = []
-        for r in range(rows):
-            rec = self.model.get_row(self.proxy.mapToSource(self.proxy.index(r,0)).row())
-            if rec and isinstance(rec[4], (int,float)): prices.append(float(rec[4]))
-        avg = sum(prices)/len(prices) if prices else 0.0
-        med = 0.0
-        if prices:
-            s = sorted(prices); mid = len(s)//2; med = s[mid] if len(s)%2 else (s[mid-1]+s[mid])/2
-        self.sb_left.setText(f"{self.translator.t('visible') if 'visible' in self.translator.translations else 'Visible'}: {rows} | {self.translator.t('total_cars')}: {total}")
-        self.sb_right.setText(f"{self.translator.t('average_price')}: {format_price(avg, self.translator.lang)} | {self.translator.t('median_price') if 'median_price' in self.translator.translations else 'Median'}: {format_price(med, self.translator.lang)}")
+        self._status_timer.start()
+
+    def _do_update_status(self):
+        rows = self._visible_row_count; total = self.model.total_rows()
+        prices = self.model.price_values(self.proxy.visible_source_rows())  # straight from the price column
+        avg = float(prices.mean()) if prices.size else 0.0
+        med = float(np.median(prices)) if prices.size else 0.0
+        visible, total_lbl, avg_lbl, med_lbl = self._status_labels; lang = self.translator.lang
+        self.sb_left.setText(f"{visible}: {rows} | {total_lbl}: {total}")
+        self.sb_right.setText(f"{avg_lbl}: {format_price(avg, lang)} | {med_lbl}: {format_price(med, lang)}")
 
     def _restore_state(self):
         dark = self.settings.value("dark", True, bool); lang = self.settings.value("lang", self.lang)
+        saved = self._settings_saved; saved["dark"] = bool(dark); saved["lang"] = lang
         self._apply_theme(bool(dark))
         if lang != self.lang:
             self.lang = lang; self.translator = Translator(self.lang)
             QApplication.setLayoutDirection(Qt.RightToLeft if self.lang=="ar" else Qt.LeftToRight)
         g = self.settings.value("geometry"); 
-        if g is not None: self.restoreGeometry(g)
+        if g is not None: self.restoreGeometry(g); saved["geometry"] = g
         ws = self.settings.value("windowState"); 
-        if ws is not None: self.restoreState(ws)
+        if ws is not None: self.restoreState(ws); saved["windowState"] = ws
         hdr = self.settings.value("tableHeaderState"); 
-        if hdr is not None: self.table.horizontalHeader().restoreState(hdr)
+        if hdr is not None: self.table.horizontalHeader().restoreState(hdr); saved["tableHeaderState"] = hdr
         sizes = self.settings.value("splitterSizes")
         if sizes:
-            try: self.splitter.setSizes([int(x) for x in sizes])
+            try: saved["splitterSizes"] = [int(x) for x in sizes]; self.splitter.setSizes(saved["splitterSizes"])
             except Exception: pass
-        hidden = set(map(str, self.settings.value("hiddenColumns", [], list)))
+        self._hidden_cols = {int(c) for c in self.settings.value("hiddenColumns", [], list) if str(c).isdigit()}
+        saved["hiddenColumns"] = [str(c) for c in sorted(self._hidden_cols)]
         for i in range(len(HEADER_KEYS)):
             if i==0: continue
-            self.table.setColumnHidden(i, str(i) in hidden)
+            self.table.setColumnHidden(i, i in self._hidden_cols)
 
     def closeEvent(self, e):
         if QMessageBox.question(self, self.translator.t("confirm"), self.translator.t("confirm_exit")) == QMessageBox.Yes:
-            self.settings.setValue("geometry", self.saveGeometry()); self.settings.setValue("windowState", self.saveState())
-            self.settings.setValue("lang", self.lang); self.settings.setValue("dark", getattr(self, "is_dark", True))
-            self.settings.setValue("tableHeaderState", self.table.horizontalHeader().saveState())
-            self.settings.setValue("splitterSizes", self.splitter.sizes()); e.accept()
+            self._set_setting("geometry", self.saveGeometry()); self._set_setting("windowState", self.saveState())
+            self._set_setting("lang", self.lang); self._set_setting("dark", getattr(self, "is_dark", True))
+            self._set_setting("tableHeaderState", self.table.horizontalHeader().saveState())
+            self._set_setting("splitterSizes", self.splitter.sizes()); self._flush_settings(); e.accept()
         else:
             e.ignore()
 
@@ -1542,11 +2195,17 @@ def ensure_translations():
 def main():
     ensure_translations()
     app = QApplication(sys.argv)
+    # open the db and read the table once on a worker while the login dialog waits for the user
+    warm = {}
+    def open_db():
+        db = Database(); db.fetch_all_cars(); warm["db"] = db
+    pool = QThreadPool.globalInstance(); pool.start(FuncTask(open_db))
     # Login
     login = LoginDialog(Translator("en"))
     if login.exec() != QDialog.Accepted:
         sys.exit(0)
-    win = MainWindow(current_user=login.username, current_role=login.role, lang="en")
+    pool.waitForDone()  # normally long finished; a failed warm-up leaves MainWindow to open the db itself
+    win = MainWindow(current_user=login.username, current_role=login.role, lang="en", db=warm.get("db"))
     win.show()
     sys.exit(app.exec())
 
@@ -1,8 +1,11 @@
+import logging
+
 from database import Database
 from managing_system import ManagingSystem
 
 def main():
     """Main application entry point"""
+    logging.basicConfig(level=logging.INFO, format="[%(name)s] %(levelname)s: %(message)s")
     db = Database()                 # Initialize the database connection and create tables
     system = ManagingSystem()      # Initialize the management system object
 
@@ -69,12 +69,12 @@ class ManagingSystem:
         car_id = input("Enter car ID to update: ")
 
         # Check if the car with this ID exists
-        existing = db.execute_query("SELECT * FROM cars WHERE id=?", (car_id,)).fetchone()
+        existing = db.fetch_car_by_id(car_id)
         if not existing:
             print("Invalid car ID!")
             return
 
-        print(f"\nUpdating: {existing[1]} {existing[2]}")
+        print(f"\nUpdating: {existing['make']} {existing['model']}")
         print("Leave blank to keep current value")
 
         # Define which fields can be updated
@@ -89,7 +89,7 @@ class ManagingSystem:
 
         # Prompt user for each field; update only if not empty
         for field, prompt, dtype in fields:
-            current_value = existing[fields.index((field, prompt, dtype)) + 1]
+            current_value = existing[field]
             new_val = input(f"{prompt} [{current_value}]: ")
             if new_val:
                 updates[field] = dtype(new_val)